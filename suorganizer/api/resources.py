@@ -0,0 +1,193 @@
+from datetime import date
+
+from django.db.models import Prefetch
+
+from blog.models import Post
+from blog.utils import month_range
+from organizer.models import NewsLink, Startup, Tag
+
+
+class ApiField:
+
+    def __init__(self, value, columns=(), prefetch=None):
+        self.value = value
+        self.columns = tuple(columns)
+        self.prefetch = prefetch
+
+
+def attribute(name):
+    return ApiField(lambda obj: getattr(obj, name), columns=(name,))
+
+
+def tag_summary(tag):
+    return {'name': tag.name, 'slug': tag.slug}
+
+
+class Resource:
+    model = None
+    name = ''
+    fields = {}
+    default_fields = ()
+    ordering = ('pk',)
+
+    def get_stamp_models(self):
+        return (self.model,)
+
+    def get_queryset(self, request):
+        return self.model.objects.all()
+
+    def get_object_filter(self, **kwargs):
+        return {'slug': kwargs['slug']}
+
+    def clean_fields(self, requested):
+        if not requested:
+            return self.default_fields
+        names = tuple(
+            name for name in requested.split(',') if name)
+        unknown = sorted(set(names) - set(self.fields))
+        if unknown:
+            raise ValueError(
+                'Unknown fields for {}: {}.'.format(
+                    self.name, ', '.join(unknown)))
+        return names
+
+    def shape_queryset(self, queryset, field_names):
+        columns = {'pk'}
+        columns.update(
+            field.lstrip('-') for field in self.ordering)
+        prefetches = []
+        for name in field_names:
+            field = self.fields[name]
+            columns.update(field.columns)
+            if field.prefetch is not None:
+                prefetches.append(field.prefetch)
+        columns.discard('pk')
+        queryset = queryset.only(*columns)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def serialize(self, obj, field_names):
+        return {
+            name: self.fields[name].value(obj)
+            for name in field_names}
+
+
+class TagResource(Resource):
+    model = Tag
+    name = 'tags'
+    fields = {
+        'name': attribute('name'),
+        'slug': attribute('slug'),
+        'url': ApiField(
+            lambda tag: tag.cached_url(
+                'api_tag_detail', slug=tag.slug),
+            columns=('slug',)),
+        'html_url': ApiField(
+            lambda tag: tag.get_absolute_url(),
+            columns=('slug',)),
+    }
+    default_fields = ('name', 'slug', 'url', 'html_url')
+    ordering = ('name', 'pk')
+
+
+class StartupResource(Resource):
+    model = Startup
+    name = 'startups'
+    fields = {
+        'name': attribute('name'),
+        'slug': attribute('slug'),
+        'description': attribute('description'),
+        'founded_date': attribute('founded_date'),
+        'contact': attribute('contact'),
+        'website': attribute('website'),
+        'url': ApiField(
+            lambda startup: startup.cached_url(
+                'api_startup_detail', slug=startup.slug),
+            columns=('slug',)),
+        'html_url': ApiField(
+            lambda startup: startup.get_absolute_url(),
+            columns=('slug',)),
+        'tags': ApiField(
+            lambda startup: [
+                tag_summary(tag) for tag in startup.api_tags],
+            prefetch=Prefetch(
+                'tags',
+                queryset=Tag.objects.only('name', 'slug'),
+                to_attr='api_tags')),
+        'newslinks': ApiField(
+            lambda startup: [
+                {'title': newslink.title,
+                 'link': newslink.link,
+                 'pub_date': newslink.pub_date}
+                for newslink in startup.api_newslinks],
+            prefetch=Prefetch(
+                'newslink_set',
+                queryset=NewsLink.objects.only(
+                    'title', 'link', 'pub_date', 'startup'),
+                to_attr='api_newslinks')),
+    }
+    default_fields = (
+        'name', 'slug', 'description', 'founded_date',
+        'contact', 'website', 'url', 'html_url', 'tags',
+        'newslinks')
+    ordering = ('name', 'pk')
+
+    def get_stamp_models(self):
+        return (Startup, Tag, NewsLink)
+
+
+class PostResource(Resource):
+    model = Post
+    name = 'posts'
+    fields = {
+        'title': attribute('title'),
+        'slug': attribute('slug'),
+        'text': attribute('text'),
+        'pub_date': attribute('pub_date'),
+        'url': ApiField(
+            lambda post: post.cached_url(
+                'api_post_detail',
+                year=post.pub_date.year,
+                month=post.pub_date.month,
+                slug=post.slug),
+            columns=('pub_date', 'slug')),
+        'html_url': ApiField(
+            lambda post: post.get_absolute_url(),
+            columns=('pub_date', 'slug')),
+        'tags': ApiField(
+            lambda post: [
+                tag_summary(tag) for tag in post.api_tags],
+            prefetch=Prefetch(
+                'tags',
+                queryset=Tag.objects.only('name', 'slug'),
+                to_attr='api_tags')),
+        'startups': ApiField(
+            lambda post: [
+                startup.slug for startup in post.api_startups],
+            prefetch=Prefetch(
+                'startups',
+                queryset=Startup.objects.only('slug'),
+                to_attr='api_startups')),
+    }
+    default_fields = (
+        'title', 'slug', 'text', 'pub_date', 'url', 'html_url',
+        'tags', 'startups')
+    ordering = ('-pub_date', 'pk')
+
+    def get_stamp_models(self):
+        return (Post, Tag, Startup)
+
+    def get_queryset(self, request):
+        queryset = Post.objects.all()
+        if not request.user.has_perm('blog.view_future_post'):
+            queryset = queryset.filter(pub_date__lte=date.today())
+        return queryset
+
+    def get_object_filter(self, **kwargs):
+        since, until = month_range(kwargs['year'], kwargs['month'])
+        return {
+            'pub_date__gte': since,
+            'pub_date__lt': until,
+            'slug': kwargs['slug'],
+        }
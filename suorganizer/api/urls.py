@@ -0,0 +1,31 @@
+from django.conf.urls import include, url
+
+from .resources import PostResource, StartupResource, TagResource
+from .views import ResourceDetail, ResourceList
+
+v1_patterns = [
+    url(r'^startups/$',
+        ResourceList.as_view(resource=StartupResource()),
+        name='api_startup_list'),
+    url(r'^startups/(?P<slug>[\w\-]+)/$',
+        ResourceDetail.as_view(resource=StartupResource()),
+        name='api_startup_detail'),
+    url(r'^tags/$',
+        ResourceList.as_view(resource=TagResource()),
+        name='api_tag_list'),
+    url(r'^tags/(?P<slug>[\w\-]+)/$',
+        ResourceDetail.as_view(resource=TagResource()),
+        name='api_tag_detail'),
+    url(r'^posts/$',
+        ResourceList.as_view(resource=PostResource()),
+        name='api_post_list'),
+    url(r'^posts/(?P<year>\d{4})/'
+        r'(?P<month>\d{1,2})/'
+        r'(?P<slug>[\w\-]+)/$',
+        ResourceDetail.as_view(resource=PostResource()),
+        name='api_post_detail'),
+]
+
+urlpatterns = [
+    url(r'^v1/', include(v1_patterns)),
+]
@@ -0,0 +1,113 @@
+import time
+from datetime import date, datetime
+from hashlib import md5
+
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.encoding import force_bytes
+from django.views.decorators.http import condition
+from django.views.generic import View
+
+from core.utils import get_model_stamp
+from organizer.utils import KeysetPaginator
+
+
+class ResourceMixin:
+    resource = None
+    fields_kwarg = 'fields'
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            self.field_names = self.resource.clean_fields(
+                request.GET.get(self.fields_kwarg))
+        except ValueError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        conditional = condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified)
+        return conditional(super().dispatch)(
+            request, *args, **kwargs)
+
+    def get_allow_future(self):
+        return self.request.user.has_perm('blog.view_future_post')
+
+    def get_stamps(self):
+        return [get_model_stamp(model)
+                for model in self.resource.get_stamp_models()]
+
+    def get_etag(self, request, *args, **kwargs):
+        key = [self.resource.name, request.get_full_path(),
+               self.get_allow_future(), date.today()]
+        key.extend(self.get_stamps())
+        return md5(force_bytes(repr(key))).hexdigest()
+
+    def get_last_modified(self, request, *args, **kwargs):
+        modified = max(self.get_stamps())
+        if not self.get_allow_future():
+            modified = max(
+                modified, time.mktime(date.today().timetuple()))
+        return datetime.utcfromtimestamp(modified)
+
+    def get_queryset(self):
+        return self.resource.shape_queryset(
+            self.resource.get_queryset(self.request),
+            self.field_names)
+
+
+class ResourceList(ResourceMixin, View):
+    after_kwarg = 'after'
+    before_kwarg = 'before'
+    limit_kwarg = 'limit'
+    paginate_by = 20
+    max_paginate_by = 100
+
+    def get_paginate_by(self):
+        try:
+            limit = int(self.request.GET.get(
+                self.limit_kwarg, self.paginate_by))
+        except ValueError:
+            return self.paginate_by
+        return max(1, min(limit, self.max_paginate_by))
+
+    def _cursor_url(self, cursor_kwarg, cursor):
+        query = self.request.GET.copy()
+        query.pop(self.after_kwarg, None)
+        query.pop(self.before_kwarg, None)
+        query[cursor_kwarg] = cursor
+        return '{}?{}'.format(
+            self.request.path, query.urlencode())
+
+    def get(self, request):
+        paginator = KeysetPaginator(
+            self.get_queryset(), self.get_paginate_by(),
+            self.resource.ordering)
+        page = paginator.page(
+            after=request.GET.get(self.after_kwarg),
+            before=request.GET.get(self.before_kwarg))
+        links = {'next': None, 'previous': None}
+        if page.has_next():
+            links['next'] = self._cursor_url(
+                self.after_kwarg, page.next_cursor())
+        if page.has_previous():
+            links['previous'] = self._cursor_url(
+                self.before_kwarg, page.previous_cursor())
+        return JsonResponse({
+            'data': [
+                self.resource.serialize(obj, self.field_names)
+                for obj in page],
+            'links': links,
+        })
+
+
+class ResourceDetail(ResourceMixin, View):
+
+    def get(self, request, **kwargs):
+        try:
+            obj = get_object_or_404(
+                self.get_queryset(),
+                **self.resource.get_object_filter(**kwargs))
+        except Http404:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        return JsonResponse({
+            'data': self.resource.serialize(obj, self.field_names),
+        })
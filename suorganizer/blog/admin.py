@@ -1,12 +1,13 @@
 from datetime import datetime
 from django.contrib import admin
-from django.db.models import Count
+
+from search.utils import SearchIndexAdminMixin
 
 from .models import Post
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ('title','pub_date','tag_count')
     date_hierarchy = 'pub_date'
     list_filter = ('pub_date',)
@@ -28,12 +29,14 @@ class PostAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        if not request.user.has_perms('view_future_post'):
+        if not request.user.has_perm('blog.view_future_post'):
             queryset = queryset.filter(pub_date__lte=datetime.now())
-        return queryset.annotate(tag_number=Count('tags'))
+        return queryset.with_tag_counts()
 
     def tag_count(self, post):
-        return post.tag_number
+        return post.tag_count
+    tag_count.admin_order_field = 'tag_number'
+    tag_count.short_description = 'tags'
 
 
 
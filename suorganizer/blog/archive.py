@@ -0,0 +1,78 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from core.utils import get_model_stamp
+
+from .models import Post
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+PERIODS = {
+    'year': lambda day: date(day.year, 1, 1),
+    'month': lambda day: date(day.year, day.month, 1),
+    'day': lambda day: day,
+}
+
+
+class ArchiveSummary:
+
+    def __init__(self, day_counts):
+        self.day_counts = day_counts
+        self.days = sorted(day_counts)
+
+    def visible_days(self, allow_future=False, since=None, until=None):
+        start = 0 if since is None else bisect_left(self.days, since)
+        end = len(self.days)
+        if until is not None:
+            end = bisect_left(self.days, until)
+        if not allow_future:
+            end = min(end, bisect_right(self.days, date.today()))
+        return self.days[start:end]
+
+    def date_list(self, period, allow_future=False,
+                  since=None, until=None, ordering='ASC'):
+        truncate = PERIODS[period]
+        dates = {
+            truncate(day) for day in self.visible_days(
+                allow_future, since, until)}
+        return sorted(dates, reverse=ordering == 'DESC')
+
+    def previous_date(self, period, since, allow_future=False):
+        days = self.visible_days(allow_future, until=since)
+        return PERIODS[period](days[-1]) if days else None
+
+    def next_date(self, period, until, allow_future=False):
+        days = self.visible_days(allow_future, since=until)
+        return PERIODS[period](days[0]) if days else None
+
+    def month_counts(self, since=None, until=None):
+        today = date.today()
+        counts = OrderedDict()
+        for day in self.visible_days(True, since, until):
+            published, future = counts.get(
+                (day.year, day.month), (0, 0))
+            if day <= today:
+                published += self.day_counts[day]
+            else:
+                future += self.day_counts[day]
+            counts[day.year, day.month] = (published, future)
+        return [
+            (year, month, published, future)
+            for (year, month), (published, future) in counts.items()]
+
+
+def get_archive_summary():
+    key = 'blog_archive:{}'.format(get_model_stamp(Post))
+    day_counts = cache.get(key)
+    if day_counts is None:
+        day_counts = dict(
+            Post.objects
+            .order_by()
+            .values_list('pub_date')
+            .annotate(Count('pk')))
+        cache.set(key, day_counts, CACHE_TIMEOUT)
+    return ArchiveSummary(day_counts)
@@ -0,0 +1,54 @@
+from datetime import datetime, time
+
+from django.contrib.syndication.views import Feed
+from django.core.urlresolvers import reverse_lazy
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from core.feeds import CachedFeedMixin
+
+from .models import Post
+from .rendering import get_rendered_post
+
+
+class BasePostFeedMixin:
+    feed_size = 10
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return get_rendered_post(item, 'body')
+
+    def item_link(self, item):
+        return item.get_absolute_url()
+
+    def item_pubdate(self, item):
+        return datetime.combine(item.pub_date, time())
+
+    def item_categories(self, item):
+        return [tag.name for tag in item.tags.all()]
+
+    def get_items(self, queryset):
+        return (
+            queryset.published()
+            .prefetch_related('tags')
+            [:self.feed_size])
+
+
+class PostFeedMixin(CachedFeedMixin, BasePostFeedMixin):
+    cache_models = (Post,)
+    title = 'Latest Startup Organizer Blog Posts'
+    link = reverse_lazy('blog_post_list')
+    description = subtitle = (
+        'Stay up to date on the hottest startup news.')
+
+    def items(self):
+        return self.get_items(Post.objects.all())
+
+
+class AtomPostFeed(PostFeedMixin, Feed):
+    feed_type = Atom1Feed
+
+
+class Rss2PostFeed(PostFeedMixin, Feed):
+    feed_type = Rss201rev2Feed
@@ -0,0 +1,135 @@
+import random
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import AutoField
+
+from core.utils import chunked
+
+from ...models import Post
+from ...utils import month_range
+
+MONTHS = 240
+
+EXPLAIN = {
+    'sqlite': 'EXPLAIN QUERY PLAN',
+    'postgresql': 'EXPLAIN',
+    'mysql': 'EXPLAIN',
+}
+
+
+class Command(BaseCommand):
+    help = ('Compare post lookups by (year, month, slug) using date '
+            'part extraction and a date range. All data is rolled '
+            'back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts',
+            dest='posts',
+            type=int,
+            default=1000000,
+            help='Posts in the benchmark table.')
+        parser.add_argument(
+            '--lookups',
+            dest='lookups',
+            type=int,
+            default=1000,
+            help='Random lookups per strategy.')
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=10000,
+            help='Posts built and inserted per round.')
+
+    def handle(self, **options):
+        with transaction.atomic():
+            author = get_user_model().objects.create_user(
+                'bench-lookup@example.com')
+            start = time.time()
+            self.populate(author, options['posts'], options['chunk_size'])
+            self.stdout.write('Inserted {} posts in {:.2f}s.'.format(
+                options['posts'], time.time() - start))
+            sample = [
+                self.key(i) for i in random.sample(
+                    range(options['posts']),
+                    min(options['lookups'], options['posts']))]
+            for name, lookup in (('extract', self.extract_lookup),
+                                 ('range', self.range_lookup)):
+                self.explain(name, lookup(*sample[0]))
+                queries = [
+                    Post.objects.filter(**lookup(*key))
+                    .query.sql_with_params()
+                    for key in sample]
+                with connection.cursor() as cursor:
+                    start = time.time()
+                    for sql, params in queries:
+                        cursor.execute(sql, params)
+                        if len(cursor.fetchall()) != 1:
+                            raise CommandError(
+                                'Lookup {} did not match one post.'
+                                .format(params))
+                    elapsed = time.time() - start
+                self.stdout.write(
+                    '{:>8}: {:.3f}s, {:.3f}ms per lookup'.format(
+                        name, elapsed, elapsed * 1000 / len(sample)))
+            transaction.set_rollback(True)
+
+    def post_key(self, i):
+        month = i % MONTHS
+        pub_date = date(
+            2000 + month // 12, month % 12 + 1,
+            1 + (i // MONTHS) % 28)
+        return (pub_date, 'bench-post-{}'.format(i // MONTHS))
+
+    def key(self, i):
+        pub_date, slug = self.post_key(i)
+        return (pub_date.year, pub_date.month, slug)
+
+    def populate(self, author, total, chunk_size):
+        fields = [
+            field for field in Post._meta.concrete_fields
+            if not isinstance(field, AutoField)]
+        for chunk in chunked(range(total), chunk_size):
+            posts = []
+            for i in chunk:
+                pub_date, slug = self.post_key(i)
+                posts.append(Post(
+                    title='Bench post {}'.format(i), slug=slug,
+                    text='Benchmark post.', pub_date=pub_date,
+                    author=author))
+            size = max(1, connection.ops.bulk_batch_size(fields, posts))
+            for batch in chunked(posts, size):
+                Post._base_manager._insert(batch, fields=fields, raw=True)
+
+    def extract_lookup(self, year, month, slug):
+        return {
+            'pub_date__year': year,
+            'pub_date__month': month,
+            'slug': slug,
+        }
+
+    def range_lookup(self, year, month, slug):
+        since, until = month_range(str(year), '{:02}'.format(month))
+        return {
+            'pub_date__gte': since,
+            'pub_date__lt': until,
+            'slug': slug,
+        }
+
+    def explain(self, name, filter_dict):
+        prefix = EXPLAIN.get(connection.vendor)
+        if prefix is None:
+            return
+        sql, params = (
+            Post.objects.filter(**filter_dict)
+            .query.sql_with_params())
+        with connection.cursor() as cursor:
+            cursor.execute('{} {}'.format(prefix, sql), params)
+            for row in cursor.fetchall():
+                self.stdout.write('{:>8}  {}'.format(
+                    name, ' '.join(str(col) for col in row)))
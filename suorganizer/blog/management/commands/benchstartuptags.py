@@ -0,0 +1,78 @@
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from organizer.models import Startup, Tag
+
+from ...models import Post
+
+
+class Command(BaseCommand):
+    help = ('Time startup tag propagation to blog posts against '
+            'post count. All data is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            dest='sizes',
+            default='100,1000,5000',
+            help='Comma-separated post counts to benchmark.')
+        parser.add_argument(
+            '--tags',
+            dest='tags',
+            type=int,
+            default=5,
+            help='Tags on the benchmark startup.')
+
+    def handle(self, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be a list of integers.')
+        self.stdout.write(
+            '{:>8} {:>12} {:>12} {:>10}'.format(
+                'posts', 'link (s)', 'new tag (s)', 'rows'))
+        for size in sizes:
+            self.stdout.write(
+                '{:>8} {:>12.3f} {:>12.3f} {:>10}'.format(
+                    size, *self.run(size, options['tags'])))
+
+    def run(self, size, tag_count):
+        with transaction.atomic():
+            author = get_user_model().objects.create_user(
+                'bench-{}@example.com'.format(size))
+            tags = [
+                Tag.objects.create(
+                    name='bench tag {}'.format(i),
+                    slug='bench-tag-{}'.format(i))
+                for i in range(tag_count + 1)]
+            startup = Startup.objects.create(
+                name='Bench Startup', slug='bench-startup',
+                description='Benchmark startup.',
+                founded_date=date.today(),
+                contact='bench@example.com',
+                website='http://example.com/')
+            startup.tags.add(*tags[:-1])
+            Post.objects.bulk_create([
+                Post(title='Bench post {}'.format(i),
+                     slug='bench-post-{}'.format(i),
+                     text='Benchmark post.',
+                     pub_date=date.today(), author=author)
+                for i in range(size)])
+            post_ids = list(
+                Post.objects
+                .filter(author=author)
+                .values_list('pk', flat=True))
+            start = time.time()
+            startup.blog_posts.add(*post_ids)
+            link_time = time.time() - start
+            start = time.time()
+            startup.tags.add(tags[-1])
+            tag_time = time.time() - start
+            rows = Post.tags.through.objects.filter(
+                post__author=author).count()
+            transaction.set_rollback(True)
+        return link_time, tag_time, rows
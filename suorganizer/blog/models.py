@@ -1,14 +1,30 @@
 from datetime import date
-from django.db import models
+from django.db import connections, models
 from organizer.models import Startup, Tag
-from django.core.urlresolvers import reverse
 from django.conf import settings
 
+from core.fields import CanonicalSlugField
+from core.utils import CachedUrlMixin
+
 
 class PostQueryset(models.QuerySet):
 
     def published(self):
-        return self.filer(pub_date__lte=date.today())
+        return self.filter(pub_date__lte=date.today())
+
+    def with_tag_counts(self):
+        qn = connections[self.db].ops.quote_name
+        through = self.model.tags.through
+        field = self.model._meta.get_field('tags')
+        return self.extra(select={
+            'tag_number':
+                'SELECT COUNT(*) FROM {through} '
+                'WHERE {through}.{column} = {table}.{pk}'.format(
+                    through=qn(through._meta.db_table),
+                    column=qn(field.m2m_column_name()),
+                    table=qn(self.model._meta.db_table),
+                    pk=qn(self.model._meta.pk.column)),
+        })
 
 
 # class PostManager(models.Manager):
@@ -20,17 +36,18 @@ class PostQueryset(models.QuerySet):
 #         return self.get_queryset().published()
 
 class BasePostManager(models.Manager):
+    natural_key_fields = ('pub_date', 'slug')
 
     def get_by_natural_key(self,pub_date,slug):
         return self.get(pub_date=pub_date, slug=slug)
 
 PostManager = BasePostManager.from_queryset(PostQueryset)
 
-class Post(models.Model):
+class Post(CachedUrlMixin, models.Model):
     title = models.CharField(max_length=63)
-    slug = models.SlugField(max_length=63,
-                            help_text='A label for URL config',
-                            unique_for_month='pub_date')
+    slug = CanonicalSlugField(max_length=63,
+                              help_text='A label for URL config',
+                              unique_for_month='pub_date')
     text = models.TextField()
     pub_date = models.DateField('date published',
                                 auto_now_add=True)
@@ -43,6 +60,7 @@ class Post(models.Model):
         verbose_name='blog post'
         ordering = ['-pub_date', 'title']
         get_latest_by = 'pub_date'
+        index_together = (('slug', 'pub_date'),)
         permissions = (
             ("view_future_post",
              "Can view unpublished Post"),
@@ -54,39 +72,41 @@ class Post(models.Model):
             self.pub_date.strftime('%Y-%m-%d'))
 
     def get_absolute_url(self):
-        return reverse(
+        return self.cached_url(
             'blog_post_detail',
-            kwargs={'year':self.pub_date.year,
-                    'month':self.pub_date.pub_date.month,
-                    'slug':self.slug})
+            year=self.pub_date.year,
+            month=self.pub_date.month,
+            slug=self.slug)
 
     def get_update_url(self):
-        return reverse(
+        return self.cached_url(
             'blog_post_update',
-            kwargs={'year': self.pub_date.year,
-                    'month': self.pub_date.month,
-                    'slug': self.slug})
+            year=self.pub_date.year,
+            month=self.pub_date.month,
+            slug=self.slug)
 
     def get_delete_url(self):
-        return reverse(
+        return self.cached_url(
             'blog_post_delete',
-            kwargs={'year':self.pub_date.year,
-                    'month':self.pub_date.month,
-                    'slug':self.slug})
+            year=self.pub_date.year,
+            month=self.pub_date.month,
+            slug=self.slug)
 
     def get_archive_year_url(self):
-        return reverse(
+        return self.cached_url(
             'blog_post_archive_year',
-            kwargs={'year':self.pub_date.year})
+            year=self.pub_date.year)
 
     def get_archive_month_url(self):
-        return reverse(
+        return self.cached_url(
             'blog_post_archive_month',
-            kwargs={'year':self.pub_date.year,
-                    'month':self.pub_date.month})
+            year=self.pub_date.year,
+            month=self.pub_date.month)
 
     @property
     def tag_count(self):
+        if hasattr(self, 'tag_number'):
+            return self.tag_number
         return self.tags.count()
 
     def natural_key(self):
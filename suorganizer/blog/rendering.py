@@ -0,0 +1,50 @@
+from hashlib import md5
+
+from django.core.cache import cache
+from django.template.defaultfilters import (
+    linebreaks_filter, truncatewords)
+from django.utils.encoding import force_bytes
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+EXCERPT_WORDS = 20
+
+RENDERERS = {
+    'body': lambda text: linebreaks_filter(text, autoescape=True),
+    'excerpt': lambda text: conditional_escape(
+        truncatewords(text, EXCERPT_WORDS)),
+}
+
+
+def rendered_key(post, kind):
+    return 'blog_post_html:{}:{}:{}'.format(
+        kind, post.pk, md5(force_bytes(post.text)).hexdigest())
+
+
+def render_post_text(post, kind):
+    return RENDERERS[kind](post.text)
+
+
+def cache_rendered_post(post):
+    rendered = {
+        rendered_key(post, kind): render_post_text(post, kind)
+        for kind in RENDERERS}
+    cache.set_many(rendered, CACHE_TIMEOUT)
+    return rendered
+
+
+def uncache_rendered_post(post):
+    cache.delete_many(
+        [rendered_key(post, kind) for kind in RENDERERS])
+
+
+def get_rendered_post(post, kind):
+    if kind not in RENDERERS:
+        raise ValueError(
+            'Unknown rendering for Post text: {}.'.format(kind))
+    key = rendered_key(post, kind)
+    html = cache.get(key)
+    if html is None:
+        html = cache_rendered_post(post)[key]
+    return mark_safe(html)
@@ -1,34 +1,92 @@
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete)
 from django.dispatch import receiver
 
-from organizer.models import Tag
+from core.signals import post_bulk_load
+from core.utils import touch_model_stamp
+from organizer.models import Startup
+from organizer.sitemaps import TagSitemap
 
 from .models import Post
+from .rendering import cache_rendered_post, uncache_rendered_post
+from .sitemaps import PostSitemap
+from .tagging import add_startup_tags
 
 
 @receiver(m2m_changed, sender=Post.startups.through)
-def assign_extra_tags(sender, **kwargs):
-    action = kwargs.get('action')
-    if action = 'post_add':
-        reverse = kwargs.get('reverse')
-        if not reverse:
-            post = kwargs.get('instance')
-            startup_pk_set = kwargs.get('pk_set')
-            tag_pk_set = (
-                Tag.objects.filter(
-                    startup__in=startup_pk_set)
-                .values_list('pk',flat=True)
-                .distinct().iterator())
-            post.tags.add(*tag_pk_set)
-        else:
-            startup = kwargs.get('instance')
-            tag_pk_set = tuple(
-                startup.tags.values_list(
-                    'pk',flat=True).iterator())
-            PostModel = kwargs.get('model')
-            post_pk_set = kwargs.get('pk_set')
-            posts_dict = (
-                PostModel.objects.in_bulk(
-                    post_pk_set))
-            for post in posts_dict.values():
-                post.tags.add(*tag_pk_set)
\ No newline at end of file
+def assign_extra_tags(sender, instance, action, reverse, pk_set,
+                      **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        add_startup_tags(post_ids=pk_set, startup_ids=[instance.pk])
+    else:
+        add_startup_tags(post_ids=[instance.pk], startup_ids=pk_set)
+
+
+@receiver(m2m_changed, sender=Startup.tags.through)
+def propagate_startup_tags(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        add_startup_tags(startup_ids=pk_set, tag_ids=[instance.pk])
+    else:
+        add_startup_tags(startup_ids=[instance.pk], tag_ids=pk_set)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def touch_post_stamp(sender, **kwargs):
+    touch_model_stamp(sender)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Post.startups.through)
+def touch_post_relations_stamp(sender, action, **kwargs):
+    if action.startswith('post_'):
+        touch_model_stamp(Post)
+
+
+@receiver(post_save, sender=Post)
+def cache_post_text(sender, instance, raw=False, **kwargs):
+    if not raw:
+        cache_rendered_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def uncache_post_text(sender, instance, **kwargs):
+    uncache_rendered_post(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def capture_post_sitemap_tags(sender, instance, **kwargs):
+    instance._sitemap_tag_ids = list(
+        instance.tags.values_list('pk', flat=True))
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_sitemap(sender, instance, **kwargs):
+    PostSitemap.invalidate([instance.pk])
+    tag_ids = getattr(instance, '_sitemap_tag_ids', None)
+    if tag_ids is None:
+        tag_ids = instance.tags.values_list('pk', flat=True)
+    TagSitemap.invalidate(tag_ids)
+
+
+@receiver(post_bulk_load, sender=Post)
+def invalidate_loaded_post_sitemap(sender, **kwargs):
+    PostSitemap.invalidate()
+    TagSitemap.invalidate()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_tag_sitemap(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        TagSitemap.invalidate([instance.pk])
+    elif pk_set:
+        TagSitemap.invalidate(pk_set)
+    else:
+        TagSitemap.invalidate()
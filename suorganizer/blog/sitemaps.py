@@ -0,0 +1,31 @@
+from django.db.models import Max
+
+from core.sitemaps import ShardedSitemap
+from core.utils import fast_reverse
+
+from .models import Post
+
+
+class PostSitemap(ShardedSitemap):
+    section = 'posts'
+    model = Post
+    row_fields = ('pub_date', 'slug')
+    changefreq = 'never'
+    priority = 0.8
+
+    def get_queryset(self):
+        return Post.objects.published()
+
+    def shard_aggregates(self):
+        return {'lastmod': Max('pub_date')}
+
+    def location(self, row):
+        pk, pub_date, slug = row
+        return fast_reverse('blog_post_detail', {
+            'year': pub_date.year,
+            'month': pub_date.month,
+            'slug': slug,
+        })
+
+    def lastmod(self, row):
+        return row[1]
@@ -0,0 +1,81 @@
+from itertools import product
+
+from django.db import connection
+from django.db.models.signals import m2m_changed
+
+from core.utils import chunked
+from organizer.models import Startup, Tag
+
+from .models import Post
+
+FILTER_CHUNK_SIZE = 400
+
+
+def missing_post_tags(post_ids=None, startup_ids=None, tag_ids=None):
+    qn = connection.ops.quote_name
+    post_startups = Post.startups.field
+    startup_tags = Startup.tags.field
+    post_tags = Post.tags.field
+    sql = (
+        'SELECT DISTINCT ps.{ps_post}, st.{st_tag} '
+        'FROM {ps_table} ps '
+        'INNER JOIN {st_table} st '
+        'ON st.{st_startup} = ps.{ps_startup} '
+        'WHERE NOT EXISTS ('
+        'SELECT 1 FROM {pt_table} pt '
+        'WHERE pt.{pt_post} = ps.{ps_post} '
+        'AND pt.{pt_tag} = st.{st_tag})').format(
+            ps_table=qn(post_startups.m2m_db_table()),
+            ps_post=qn(post_startups.m2m_column_name()),
+            ps_startup=qn(post_startups.m2m_reverse_name()),
+            st_table=qn(startup_tags.m2m_db_table()),
+            st_startup=qn(startup_tags.m2m_column_name()),
+            st_tag=qn(startup_tags.m2m_reverse_name()),
+            pt_table=qn(post_tags.m2m_db_table()),
+            pt_post=qn(post_tags.m2m_column_name()),
+            pt_tag=qn(post_tags.m2m_reverse_name()))
+    columns = []
+    id_chunks = []
+    for column, ids in (
+            ('ps.' + qn(post_startups.m2m_column_name()), post_ids),
+            ('ps.' + qn(post_startups.m2m_reverse_name()), startup_ids),
+            ('st.' + qn(startup_tags.m2m_reverse_name()), tag_ids)):
+        if ids is None:
+            continue
+        ids = list(ids)
+        if not ids:
+            return set()
+        columns.append(column)
+        id_chunks.append(list(chunked(ids, FILTER_CHUNK_SIZE)))
+    pairs = set()
+    with connection.cursor() as cursor:
+        for chunks in product(*id_chunks):
+            where = ''.join(
+                ' AND {} IN ({})'.format(
+                    column, ', '.join(['%s'] * len(ids)))
+                for column, ids in zip(columns, chunks))
+            cursor.execute(
+                sql + where, [pk for ids in chunks for pk in ids])
+            pairs.update(
+                (post_id, tag_id) for post_id, tag_id in cursor.fetchall())
+    return pairs
+
+
+def add_startup_tags(post_ids=None, startup_ids=None, tag_ids=None):
+    pairs = missing_post_tags(post_ids, startup_ids, tag_ids)
+    if not pairs:
+        return 0
+    through = Post.tags.through
+    through.objects.bulk_create([
+        through(post_id=post_id, tag_id=tag_id)
+        for post_id, tag_id in pairs])
+    posts_by_tag = {}
+    for post_id, tag_id in pairs:
+        posts_by_tag.setdefault(tag_id, set()).add(post_id)
+    tags = Tag.objects.in_bulk(list(posts_by_tag))
+    for tag_id, post_ids in posts_by_tag.items():
+        m2m_changed.send(
+            sender=through, action='post_add', instance=tags[tag_id],
+            reverse=True, model=Post, pk_set=post_ids,
+            using=through.objects.db)
+    return len(pairs)
@@ -0,0 +1,15 @@
+from django import template
+
+from ..rendering import get_rendered_post
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_body(post):
+    return get_rendered_post(post, 'body')
+
+
+@register.simple_tag
+def post_excerpt(post):
+    return get_rendered_post(post, 'excerpt')
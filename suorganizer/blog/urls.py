@@ -1,5 +1,6 @@
 from django.conf.urls import url
 
+from .feeds import AtomPostFeed, Rss2PostFeed
 from .views import (
     PostCreate, PostList, PostUpdate,
     PostDelete, PostArchiveYear, PostArchiveMonth,
@@ -17,6 +18,12 @@ urlpatterns = [
     url(r'^create/$',
         PostCreate.as_view(),
         name='blog_post_create'),
+    url(r'^feed/atom/$',
+        AtomPostFeed(),
+        name='blog_atom_feed'),
+    url(r'^feed/rss/$',
+        Rss2PostFeed(),
+        name='blog_rss_feed'),
     url(r'^(?P<year>\d{4})/'
         r'(?P<month>\d{1,2})/'
         r'(?P<slug>[\w\-]+)/'
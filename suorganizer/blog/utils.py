@@ -1,18 +1,111 @@
+from datetime import date
+
 from django.shortcuts import get_object_or_404
 from django.http import Http404, HttpResponseRedirect
 from django.views.generic.dates import (
     DateMixin, MonthMixin as BaseMonthMixin,
     YearMixin as BaseYearMixin, _date_from_string)
 
+from .archive import get_archive_summary
 from .models import Post
 
 
+def month_range(year, month):
+    since = _date_from_string(year, '%Y', month, '%m')
+    if since.month == 12:
+        until = since.replace(year=since.year + 1, month=1)
+    else:
+        until = since.replace(month=since.month + 1)
+    return (since, until)
+
+
 class AllowFuturePermissionMixin():
 
     def get_allow_future(self):
         return self.request.user.has_perm('blog.view_future_post')
 
 
+class ArchiveSummaryMixin:
+
+    def get_archive_summary(self):
+        if not hasattr(self, '_archive_summary'):
+            self._archive_summary = get_archive_summary()
+        return self._archive_summary
+
+    def get_archive_range(self):
+        return (None, None)
+
+    def get_month_counts(self):
+        since, until = self.get_archive_range()
+        allow_future = self.get_allow_future()
+        return [
+            (date(year, month, 1), published,
+             future if allow_future else 0)
+            for year, month, published, future
+            in self.get_archive_summary().month_counts(since, until)
+            if published or allow_future]
+
+    def get_date_list(self, queryset, date_type=None, ordering='ASC'):
+        if date_type is None:
+            date_type = self.get_date_list_period()
+        since, until = self.get_archive_range()
+        date_list = self.get_archive_summary().date_list(
+            date_type, self.get_allow_future(),
+            since, until, ordering)
+        if not date_list and not self.get_allow_empty():
+            raise Http404(
+                "No {} available".format(
+                    queryset.model._meta.verbose_name_plural))
+        return date_list
+
+
+class YearArchiveSummaryMixin(ArchiveSummaryMixin):
+
+    def get_archive_range(self):
+        date = _date_from_string(
+            self.get_year(), self.get_year_format())
+        return (self._get_current_year(date),
+                self._get_next_year(date))
+
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault('month_counts', self.get_month_counts())
+        return super().get_context_data(**kwargs)
+
+    def get_next_year(self, date):
+        return self.get_archive_summary().next_date(
+            'year', self._get_next_year(date),
+            self.get_allow_future())
+
+    def get_previous_year(self, date):
+        return self.get_archive_summary().previous_date(
+            'year', self._get_current_year(date),
+            self.get_allow_future())
+
+
+class MonthArchiveSummaryMixin(ArchiveSummaryMixin):
+
+    def get_archive_range(self):
+        date = _date_from_string(
+            self.get_year(), self.get_year_format(),
+            self.get_month(), self.get_month_format())
+        return (self._get_current_month(date),
+                self._get_next_month(date))
+
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault('month_counts', self.get_month_counts())
+        return super().get_context_data(**kwargs)
+
+    def get_next_month(self, date):
+        return self.get_archive_summary().next_date(
+            'month', self._get_next_month(date),
+            self.get_allow_future())
+
+    def get_previous_month(self, date):
+        return self.get_archive_summary().previous_date(
+            'month', self._get_current_month(date),
+            self.get_allow_future())
+
+
 class MonthMixin(BaseMonthMixin):
     month_format = '%m'
     month_query_kwarg = 'month'
@@ -71,10 +164,11 @@ class PostGetMixin:
                 self.errors['url_kwargs'].format(self.__class__.__name__))
         date_field = self.date_field
         slug_field = self.get_slug_field()
+        since, until = month_range(year, month)
         filter_dict = {
-            date_field + '__year':year,
-            date_field + '__month':month,
-            slug_field:slug,
+            date_field + '__gte': since,
+            date_field + '__lt': until,
+            slug_field: slug,
         }
         if queryset is None:
             queryset = self.get_queryset()
@@ -122,11 +216,11 @@ class DateObjectMixin(
             until = self._make_date_lookup_arg(self._get_next_month(date))
             return {
                 '%s__gte' % date_field: since,
-                '%s__lt' % date_field: util
+                '%s__lt' % date_field: until
             }
         else:
             return {
-                '%s__get' % date_field: date,
+                '%s__gte' % date_field: date,
                 '%s__lt' % date_field: self._get_next_month(date),
             }
 
@@ -10,11 +10,13 @@ from .models import Post
 from .forms import PostForm
 from .utils import (
     PostGetMixin, DateObjectMixin, AllowFuturePermissionMixin, 
-    PostFormValidMixin)
+    PostFormValidMixin, ArchiveSummaryMixin,
+    MonthArchiveSummaryMixin, YearArchiveSummaryMixin)
 from user.decorators import require_authenticated_permission
 
 
-from core.utils import UpdateView
+from core.pagecache import PageCacheListMixin
+from core.utils import CachedCountPaginator, UpdateView
 
 
 class PostDetail(DateObjectMixin, DetailView):
@@ -22,20 +24,32 @@ class PostDetail(DateObjectMixin, DetailView):
     date_field = 'pub_date'
     model = Post
 
-class PostArchiveYear(YearArchiveView):
+class PostArchiveYear(
+        PageCacheListMixin,
+        AllowFuturePermissionMixin,
+        YearArchiveSummaryMixin,
+        YearArchiveView):
     model = Post
+    queryset = Post.objects.with_tag_counts()
     date_field = 'pub_date'
     make_object_list = True
 
 
-class PostArchiveMonth(MonthArchiveView):
+class PostArchiveMonth(
+        PageCacheListMixin,
+        AllowFuturePermissionMixin,
+        MonthArchiveSummaryMixin,
+        MonthArchiveView):
     model = Post
+    queryset = Post.objects.with_tag_counts()
     date_field = 'pub_date'
     month_format = '%m'
 
 
 class PostList(
+        PageCacheListMixin,
         AllowFuturePermissionMixin,
+        ArchiveSummaryMixin,
         ArchiveIndexView):
     allow_empty = True
     context_object_name = 'post_list'
@@ -43,6 +57,8 @@ class PostList(
     make_object_list = True
     model = Post
     paginate_by = 5
+    queryset = Post.objects.with_tag_counts()
+    paginator_class = CachedCountPaginator
     template_name = 'blog/post_list.html'
 
 
@@ -0,0 +1,58 @@
+import time
+from datetime import date, datetime
+from hashlib import md5
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.encoding import force_bytes
+from django.views.decorators.http import condition
+
+from .pagecache import (
+    collection_started, collection_tag, get_tagged, set_tagged,
+    start_collecting, stop_collecting)
+
+
+class CachedFeedMixin:
+    cache_models = ()
+    cache_timeout = 60 * 60 * 24
+
+    def get_cache_key(self, request):
+        return 'feed_cache:{}.{}:{}:{}'.format(
+            type(self).__module__, type(self).__name__,
+            date.today().isoformat(),
+            md5(force_bytes(request.build_absolute_uri())).hexdigest())
+
+    def build_feed(self, request, key, *args, **kwargs):
+        started = collection_started() or time.time()
+        start_collecting()
+        try:
+            response = super().__call__(request, *args, **kwargs)
+        finally:
+            tags = stop_collecting()
+        tags.update(
+            collection_tag(model) for model in self.cache_models)
+        etag = md5(response.content).hexdigest()
+        previous = cache.get(key)
+        if previous is not None and previous[1][2] == etag:
+            modified = previous[1][3]
+        else:
+            modified = datetime.utcnow().replace(microsecond=0)
+        feed = (response.content, response['Content-Type'],
+                etag, modified)
+        set_tagged(key, tags, feed, started, self.cache_timeout)
+        return feed
+
+    def __call__(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        entry = get_tagged(key)
+        if entry is None:
+            feed = self.build_feed(request, key, *args, **kwargs)
+        else:
+            feed = entry[1]
+        content, content_type, etag, modified = feed
+
+        @condition(etag_func=lambda request: etag,
+                   last_modified_func=lambda request: modified)
+        def serve(request):
+            return HttpResponse(content, content_type=content_type)
+        return serve(request)
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class CanonicalSlugField(models.SlugField):
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if isinstance(value, str):
+            return value.lower()
+        return value
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if isinstance(value, str):
+            return value.lower()
+        return value
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if isinstance(value, str):
+            value = value.lower()
+            setattr(model_instance, self.attname, value)
+        return value
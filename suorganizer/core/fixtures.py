@@ -0,0 +1,461 @@
+import gzip
+import json
+import os
+import sys
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers import sort_dependencies
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.python import Serializer
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import AutoField, Q
+from django.utils.encoding import force_text
+
+from .signals import post_bulk_load
+from .utils import chunked, touch_model_stamp
+
+SEPARATORS = ' \t\r\n,[]'
+
+
+def iter_json_objects(stream, read_size=1 << 16):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    while True:
+        while (position < len(buffer)
+               and buffer[position] in SEPARATORS):
+            position += 1
+        try:
+            obj, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            data = stream.read(read_size)
+            if not data:
+                if buffer[position:].strip(SEPARATORS):
+                    decoder.raw_decode(buffer, position)
+                return
+            buffer = buffer[position:] + data
+            position = 0
+            continue
+        yield obj
+
+
+def open_fixture(path, mode='r', compress=None):
+    if compress is None:
+        compress = path.endswith('.gz')
+    if path == '-':
+        stream = sys.stdin if mode == 'r' else sys.stdout
+        if not compress:
+            return stream
+        return gzip.open(stream.buffer, mode + 't', encoding='utf-8')
+    if compress:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def find_fixture(label):
+    if label == '-' or os.path.isfile(label):
+        return label
+    dirs = [
+        os.path.join(app_config.path, 'fixtures')
+        for app_config in apps.get_app_configs()]
+    dirs.extend(settings.FIXTURE_DIRS)
+    for directory in dirs:
+        for suffix in ('', '.json', '.jsonl', '.json.gz', '.jsonl.gz'):
+            path = os.path.join(directory, label + suffix)
+            if os.path.isfile(path):
+                return path
+    raise DeserializationError(
+        'No fixture named {!r} found.'.format(label))
+
+
+def key_fields(model):
+    paths = getattr(model._default_manager, 'natural_key_fields', None)
+    if not paths or not hasattr(model, 'natural_key'):
+        return None
+    return paths
+
+
+def path_field(model, path):
+    field = None
+    for name in path.split('__'):
+        if field is not None:
+            model = field.rel.to
+        field = model._meta.get_field(name)
+    return field
+
+
+def local_key_fields(model):
+    paths = key_fields(model)
+    if paths is None:
+        return None
+    return tuple(
+        model._meta.get_field(path.split('__')[0]).attname
+        for path in paths)
+
+
+def trim_cache(cache, size, incoming, keep=()):
+    if len(cache) + incoming <= size:
+        return
+    kept = {key: cache[key] for key in keep if key in cache}
+    cache.clear()
+    cache.update(kept)
+
+
+class FixtureLoader:
+    lookup_size = 400
+
+    def __init__(self, using=DEFAULT_DB_ALIAS,
+                 chunk_size=400, cache_size=250000):
+        self.using = using
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.pk_cache = {}
+        self.counts = Counter()
+
+    def manager(self, model):
+        return model._default_manager.db_manager(self.using)
+
+    def normalize(self, model, paths, key):
+        if len(key) != len(paths):
+            raise DeserializationError(
+                'Natural key {!r} does not match {}.'.format(
+                    key, model._meta.object_name))
+        return tuple(
+            force_text(path_field(model, path).to_python(value))
+            for path, value in zip(paths, key))
+
+    def lookup(self, model, paths, keys):
+        found = {}
+        size = max(1, self.lookup_size // len(paths))
+        for chunk in chunked(keys, size):
+            if len(paths) == 1:
+                condition = Q(**{
+                    paths[0] + '__in': [key[0] for key in chunk]})
+            else:
+                condition = reduce(or_, (
+                    Q(**dict(zip(paths, key))) for key in chunk))
+            rows = (
+                self.manager(model)
+                .filter(condition)
+                .values_list('pk', *paths))
+            for row in rows:
+                found[tuple(force_text(v) for v in row[1:])] = row[0]
+        return found
+
+    def resolve(self, model, keys):
+        cache = self.pk_cache.setdefault(model, {})
+        paths = key_fields(model)
+        if paths is None:
+            for key in keys:
+                if key not in cache:
+                    cache[key] = self.manager(
+                        model).get_by_natural_key(*key).pk
+            return cache
+        keys = {self.normalize(model, paths, key) for key in keys}
+        missing = [key for key in keys if key not in cache]
+        if missing:
+            trim_cache(cache, self.cache_size, len(missing), keys)
+            cache.update(self.lookup(model, paths, missing))
+        return cache
+
+    def pk_for(self, model, value):
+        if not isinstance(value, list):
+            return model._meta.pk.to_python(value)
+        paths = key_fields(model)
+        key = tuple(value)
+        if paths is not None:
+            key = self.normalize(model, paths, key)
+        try:
+            return self.pk_cache[model][key]
+        except KeyError:
+            raise DeserializationError(
+                '{} matching {!r} does not exist; fixtures must '
+                'list dependencies first.'.format(
+                    model._meta.object_name, value))
+
+    def load(self, stream):
+        for chunk in chunked(iter_json_objects(stream), self.chunk_size):
+            self.load_chunk(chunk)
+
+    def load_chunk(self, records):
+        by_model = {}
+        for record in records:
+            try:
+                model = apps.get_model(record['model'])
+            except (KeyError, LookupError, ValueError):
+                raise DeserializationError(
+                    'Invalid model identifier: {!r}'.format(
+                        record.get('model')))
+            by_model.setdefault(model, []).append(record)
+        for model in sort_dependencies([(None, list(by_model))]):
+            self.load_records(model, by_model[model])
+
+    def related_keys(self, model, records):
+        keys = {}
+        opts = model._meta
+        for record in records:
+            for name, value in record['fields'].items():
+                field = opts.get_field(name)
+                if field.rel is None or value is None:
+                    continue
+                values = value if field.many_to_many else [value]
+                for item in values:
+                    if isinstance(item, list):
+                        keys.setdefault(
+                            field.rel.to, set()).add(tuple(item))
+        for related_model, related_keys in keys.items():
+            self.resolve(related_model, related_keys)
+
+    def build(self, model, record):
+        opts = model._meta
+        data = {}
+        m2m_data = {}
+        if record.get('pk') is not None:
+            data[opts.pk.attname] = opts.pk.to_python(record['pk'])
+        for name, value in record['fields'].items():
+            field = opts.get_field(name)
+            if field.many_to_many:
+                m2m_data[field] = [
+                    self.pk_for(field.rel.to, item) for item in value]
+            elif field.rel is not None:
+                data[field.attname] = (
+                    None if value is None
+                    else self.pk_for(field.rel.to, value))
+            else:
+                data[field.attname] = field.to_python(value)
+        return model(**data), m2m_data
+
+    def mark_existing(self, model, objs):
+        with_pk = [obj for obj in objs if obj.pk is not None]
+        existing = set()
+        for chunk in chunked(with_pk, self.lookup_size):
+            existing.update(
+                self.manager(model)
+                .filter(pk__in=[obj.pk for obj in chunk])
+                .values_list('pk', flat=True))
+        for obj in with_pk:
+            obj._state.adding = obj.pk not in existing
+        attnames = local_key_fields(model)
+        without_pk = [obj for obj in objs if obj.pk is None]
+        if attnames and without_pk:
+            found = self.lookup(
+                model, attnames, {self.local_key(obj, attnames)
+                                  for obj in without_pk})
+            for obj in without_pk:
+                obj.pk = found.get(self.local_key(obj, attnames))
+                obj._state.adding = obj.pk is None
+
+    def local_key(self, obj, attnames):
+        return tuple(
+            force_text(getattr(obj, attname)) for attname in attnames)
+
+    def insert(self, model, objs):
+        opts = model._meta
+        connection = connections[self.using]
+        for has_pk in (True, False):
+            batch = [obj for obj in objs if (obj.pk is not None) == has_pk]
+            if not batch:
+                continue
+            fields = opts.concrete_fields
+            if not has_pk:
+                fields = [
+                    field for field in fields
+                    if not isinstance(field, AutoField)]
+            size = max(1, connection.ops.bulk_batch_size(fields, batch))
+            for chunk in chunked(batch, size):
+                model._base_manager._insert(
+                    chunk, fields=fields, using=self.using, raw=True)
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = self.using
+
+    def recover_pks(self, model, objs):
+        attnames = local_key_fields(model)
+        missing = [obj for obj in objs if obj.pk is None]
+        if not missing:
+            return
+        found = self.lookup(
+            model, attnames,
+            {self.local_key(obj, attnames) for obj in missing})
+        for obj in missing:
+            obj.pk = found[self.local_key(obj, attnames)]
+
+    def save_m2m(self, pairs, replaced):
+        fields = {field for obj, m2m_data in pairs for field in m2m_data}
+        for field in fields:
+            through = field.rel.through
+            if not through._meta.auto_created:
+                continue
+            manager = through._default_manager.db_manager(self.using)
+            source = field.m2m_column_name()
+            target = field.m2m_reverse_name()
+            for chunk in chunked(replaced, self.lookup_size):
+                manager.filter(**{source + '__in': chunk}).delete()
+            rows = [
+                through(**{source: obj.pk, target: pk})
+                for obj, m2m_data in pairs
+                for pk in set(m2m_data.get(field, ()))]
+            manager.bulk_create(rows)
+
+    def load_records(self, model, records):
+        self.related_keys(model, records)
+        pairs = [self.build(model, record) for record in records]
+        objs = [obj for obj, m2m_data in pairs]
+        self.mark_existing(model, objs)
+        bulk = local_key_fields(model) is not None
+        new, single = [], []
+        for obj in objs:
+            if obj._state.adding and (bulk or obj.pk is not None):
+                new.append(obj)
+            else:
+                single.append(obj)
+        replaced = [obj.pk for obj in single if obj.pk is not None]
+        self.insert(model, new)
+        self.recover_pks(model, new)
+        for obj in single:
+            obj.save_base(using=self.using, raw=True)
+        self.save_m2m(pairs, replaced)
+        paths = key_fields(model)
+        if paths and all('__' not in path for path in paths):
+            cache = self.pk_cache.setdefault(model, {})
+            trim_cache(cache, self.cache_size, len(objs))
+            for obj in objs:
+                cache[self.local_key(obj, paths)] = obj.pk
+        self.counts[model] += len(objs)
+        post_bulk_load.send(
+            sender=model, instances=objs, using=self.using)
+
+    def finish(self):
+        for model in self.counts:
+            touch_model_stamp(model)
+
+
+class ChunkSerializer(Serializer):
+
+    def __init__(self, m2m_values):
+        self.m2m_values = m2m_values
+
+    def handle_m2m_field(self, obj, field):
+        if field.rel.through._meta.auto_created:
+            self._current[field.name] = self.m2m_values[field].get(
+                obj.pk, [])
+
+
+class FixtureDumper:
+
+    def __init__(self, using=DEFAULT_DB_ALIAS,
+                 chunk_size=1000, cache_size=50000):
+        self.using = using
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.key_cache = {}
+        self.counts = Counter()
+
+    def queryset(self, model):
+        related = [
+            field.name for field in model._meta.local_fields
+            if field.rel is not None
+            and hasattr(field.rel.to, 'natural_key')]
+        queryset = (
+            model._default_manager.db_manager(self.using)
+            .order_by('pk'))
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+
+    def natural_keys(self, model, pks):
+        cache = self.key_cache.setdefault(model, {})
+        missing = [pk for pk in pks if pk not in cache]
+        if missing:
+            trim_cache(cache, self.cache_size, len(missing), pks)
+            for chunk in chunked(missing, FixtureLoader.lookup_size):
+                for obj in self.queryset(model).filter(pk__in=chunk):
+                    cache[obj.pk] = obj.natural_key()
+        return cache
+
+    def m2m_values(self, model, pks):
+        values = {}
+        for field in model._meta.many_to_many:
+            through = field.rel.through
+            if not field.serialize or not through._meta.auto_created:
+                continue
+            source = field.m2m_column_name()
+            target = field.m2m_reverse_name()
+            target_name = field.m2m_reverse_field_name()
+            ordering = [
+                '-' * name.startswith('-')
+                + target_name + '__' + name.lstrip('-')
+                for name in field.rel.to._meta.ordering]
+            rows = list(
+                through._default_manager.db_manager(self.using)
+                .filter(**{source + '__in': pks})
+                .order_by(*ordering or [target])
+                .values_list(source, target))
+            if hasattr(field.rel.to, 'natural_key'):
+                keys = self.natural_keys(
+                    field.rel.to, {target_pk for _, target_pk in rows})
+            else:
+                keys = {
+                    target_pk: force_text(target_pk, strings_only=True)
+                    for _, target_pk in rows}
+            by_source = values[field] = {}
+            for source_pk, target_pk in rows:
+                by_source.setdefault(source_pk, []).append(
+                    keys[target_pk])
+        return values
+
+    def records(self, model):
+        queryset = self.queryset(model)
+        last_pk = None
+        while True:
+            chunk = queryset
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            objs = list(chunk[:self.chunk_size].iterator())
+            if not objs:
+                return
+            last_pk = objs[-1].pk
+            serializer = ChunkSerializer(
+                self.m2m_values(model, [obj.pk for obj in objs]))
+            for record in serializer.serialize(
+                    objs, use_natural_foreign_keys=True,
+                    use_natural_primary_keys=True):
+                yield record
+            self.counts[model] += len(objs)
+
+    def dump(self, models, stream, record_format='json', indent=None):
+        first = True
+        if record_format == 'json':
+            stream.write('[')
+        for model in models:
+            for record in self.records(model):
+                data = json.dumps(
+                    record, cls=DjangoJSONEncoder, ensure_ascii=False,
+                    indent=None if record_format == 'jsonl' else indent)
+                if record_format == 'jsonl':
+                    stream.write(data + '\n')
+                else:
+                    stream.write(('\n' if first else ',\n') + data)
+                first = False
+        if record_format == 'json':
+            stream.write('\n]\n')
+
+
+def sorted_models(models):
+    return sort_dependencies([(None, list(models))])
+
+
+def fixture_path(model, extension, directory=None):
+    filename = '{}_data{}'.format(model._meta.model_name, extension)
+    if directory is not None:
+        return os.path.join(directory, filename)
+    app_fixtures = os.path.join(
+        model._meta.app_config.path, 'fixtures')
+    if os.path.isdir(app_fixtures) or not settings.FIXTURE_DIRS:
+        return os.path.join(app_fixtures, filename)
+    return os.path.join(settings.FIXTURE_DIRS[0], filename)
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...sitemaps import (
+    get_site_root, get_sitemap_cache_dir, get_sitemaps, index_path,
+    remove_stale_dirs, render_index, write_through)
+from ...views import shard_url
+
+
+class Command(BaseCommand):
+    help = ("Write the sitemap index and every shard to today's "
+            'sitemap cache directory and remove older directories.')
+
+    def handle(self, **options):
+        start = time.time()
+        root = get_site_root()
+        sitemaps = get_sitemaps()
+        files = 0
+        for sitemap_class in sitemaps:
+            sitemap = sitemap_class()
+            for shard, lastmod in sitemap.shards():
+                self.write(
+                    sitemap.shard_path(shard),
+                    sitemap.render_shard(shard, root),
+                    sitemap.section)
+                files += 1
+        self.write(
+            index_path(), render_index(sitemaps, shard_url, root), 'index')
+        remove_stale_dirs(get_sitemap_cache_dir())
+        self.stdout.write('Wrote {} sitemap files to {} in {:.2f}s.'.format(
+            files + 1, get_sitemap_cache_dir(), time.time() - start))
+
+    def write(self, path, chunks, stamp):
+        for chunk in write_through(path, chunks, stamp):
+            pass
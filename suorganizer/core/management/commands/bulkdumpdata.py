@@ -0,0 +1,123 @@
+import os
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from ...fixtures import (
+    FixtureDumper, fixture_path, open_fixture, sorted_models)
+
+DEFAULT_LABELS = (
+    'user.User', 'organizer.Tag', 'organizer.Startup',
+    'organizer.NewsLink', 'blog.Post')
+
+
+class Command(BaseCommand):
+    help = ('Stream organizer, blog and user data as natural-key '
+            'fixtures with constant memory use.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            nargs='*',
+            metavar='app_label[.ModelName]',
+            help='Apps or models to dump; defaults to users, '
+                 'tags, startups, news links and posts.')
+        parser.add_argument(
+            '--database',
+            dest='database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to dump from.')
+        parser.add_argument(
+            '--format',
+            dest='format',
+            choices=('json', 'jsonl'),
+            default='json',
+            help='A JSON array like dumpdata, or one object per line.')
+        parser.add_argument(
+            '--indent',
+            dest='indent',
+            type=int,
+            default=None,
+            help='Indentation for the json format.')
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            dest='gzip',
+            default=False,
+            help='Compress the output with gzip.')
+        parser.add_argument(
+            '-o', '--output',
+            dest='output',
+            default='-',
+            help='File to write to; "-" writes to stdout. With '
+                 '--split, the directory for the per-model files.')
+        parser.add_argument(
+            '--split',
+            action='store_true',
+            dest='split',
+            default=False,
+            help='Write one <model>_data file per model, in the '
+                 'fixtures directories unless --output is given.')
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Objects fetched per query.')
+
+    def get_models(self, labels):
+        models = []
+        for label in labels or DEFAULT_LABELS:
+            try:
+                if '.' in label:
+                    found = [apps.get_model(label)]
+                else:
+                    found = apps.get_app_config(label).get_models()
+            except (LookupError, ValueError) as error:
+                raise CommandError(
+                    'Unknown app or model: {}'.format(error))
+            for model in found:
+                if model not in models:
+                    models.append(model)
+        return sorted_models(models)
+
+    def handle(self, *labels, **options):
+        models = self.get_models(labels)
+        dumper = FixtureDumper(
+            using=options['database'],
+            chunk_size=options['chunk_size'])
+        extension = '.' + options['format']
+        if options['gzip']:
+            extension += '.gz'
+        start = time.time()
+        if options['split']:
+            directory = options['output']
+            if directory == '-':
+                directory = None
+            elif not os.path.isdir(directory):
+                os.makedirs(directory)
+            for model in models:
+                path = fixture_path(model, extension, directory)
+                self.write(dumper, [model], path, options)
+        else:
+            self.write(dumper, models, options['output'], options)
+        total = sum(dumper.counts.values())
+        elapsed = time.time() - start
+        self.stderr.write(
+            'Dumped {} object(s) in {:.2f}s ({:.0f} objects/s).'.format(
+                total, elapsed, total / elapsed if elapsed else 0))
+
+    def write(self, dumper, models, path, options):
+        stream = open_fixture(path, 'w', compress=options['gzip'])
+        try:
+            dumper.dump(
+                models, stream,
+                record_format=options['format'],
+                indent=options['indent'])
+        finally:
+            if path == '-' and not options['gzip']:
+                stream.flush()
+            else:
+                stream.close()
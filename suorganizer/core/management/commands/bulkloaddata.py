@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from ...fixtures import FixtureLoader, find_fixture, open_fixture
+
+
+class Command(BaseCommand):
+    help = ('Load JSON or JSONL fixtures in bulk, resolving natural '
+            'keys per chunk.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            nargs='+',
+            metavar='fixture',
+            help='Fixture names or paths; "-" reads stdin.')
+        parser.add_argument(
+            '--database',
+            dest='database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to load the fixtures into.')
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=400,
+            help='Objects decoded and inserted per round.')
+        parser.add_argument(
+            '--cache-size',
+            dest='cache_size',
+            type=int,
+            default=250000,
+            help='Resolved natural keys kept per model.')
+
+    def handle(self, *fixture_labels, **options):
+        loader = FixtureLoader(
+            using=options['database'],
+            chunk_size=options['chunk_size'],
+            cache_size=options['cache_size'])
+        start = time.time()
+        try:
+            paths = [find_fixture(label) for label in fixture_labels]
+            with transaction.atomic(using=options['database']):
+                for path in paths:
+                    stream = open_fixture(path)
+                    try:
+                        loader.load(stream)
+                    finally:
+                        if path != '-':
+                            stream.close()
+        except (DeserializationError, ValueError) as error:
+            raise CommandError(
+                'Problem loading fixtures: {}'.format(error))
+        loader.finish()
+        total = sum(loader.counts.values())
+        elapsed = time.time() - start
+        self.stdout.write(
+            'Installed {} object(s) from {} fixture(s) in {:.2f}s '
+            '({:.0f} objects/s).'.format(
+                total, len(paths), elapsed,
+                total / elapsed if elapsed else 0))
@@ -0,0 +1,85 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from ...fields import CanonicalSlugField
+from ...utils import model_label
+
+
+class Command(BaseCommand):
+    help = 'Lowercase slugs stored before slugs were canonical.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Report changes without saving them.')
+
+    def canonical_fields(self):
+        for model in apps.get_models():
+            for field in model._meta.local_fields:
+                if isinstance(field, CanonicalSlugField):
+                    yield model, field
+
+    def unique_filters(self, model, field, row):
+        if field.unique:
+            yield {}
+        for fields in model._meta.unique_together:
+            if field.name in fields:
+                yield {
+                    name: row[name]
+                    for name in fields if name != field.name}
+
+    def conflicts(self, model, field, row, slug):
+        for filter_dict in self.unique_filters(model, field, row):
+            filter_dict[field.name] = slug
+            queryset = (
+                model._default_manager
+                .filter(**filter_dict)
+                .exclude(pk=row['pk']))
+            if queryset.exists():
+                return True
+        return False
+
+    def canonicalize(self, model, field, dry_run):
+        other_fields = {
+            name
+            for fields in model._meta.unique_together
+            if field.name in fields
+            for name in fields if name != field.name}
+        rows = (
+            model._default_manager
+            .annotate(canonical_slug=Lower(field.name))
+            .exclude(**{field.name: F('canonical_slug')})
+            .values('pk', field.name, *other_fields))
+        changed = skipped = 0
+        for row in rows.iterator():
+            slug = row[field.name].lower()
+            if self.conflicts(model, field, row, slug):
+                skipped += 1
+                self.stderr.write(
+                    'Skipped {} {}: slug "{}" is taken.'.format(
+                        model._meta.verbose_name,
+                        row['pk'], slug))
+                continue
+            if not dry_run:
+                (model._default_manager
+                    .filter(pk=row['pk'])
+                    .update(**{field.name: slug}))
+            changed += 1
+        return changed, skipped
+
+    def handle(self, **options):
+        dry_run = options['dry_run']
+        for model, field in self.canonical_fields():
+            with transaction.atomic():
+                changed, skipped = self.canonicalize(
+                    model, field, dry_run)
+            self.stdout.write(
+                '{}.{}: {} canonicalized, {} skipped.'.format(
+                    model_label(model), field.name,
+                    changed, skipped))
@@ -0,0 +1,32 @@
+from .pagecache import (
+    get_cached_page, is_cacheable_request, is_cacheable_response,
+    page_key, set_cached_page, start_collecting, stop_collecting)
+
+
+class PageCacheMiddleware:
+
+    def process_request(self, request):
+        request._page_cache_key = None
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        request._page_cache_started = start_collecting(reset=True)
+        if not is_cacheable_request(request):
+            return None
+        key = page_key(request)
+        response = get_cached_page(key)
+        if response is not None:
+            stop_collecting()
+            del request._page_cache_started
+            return response
+        request._page_cache_key = key
+        return None
+
+    def process_response(self, request, response):
+        if not hasattr(request, '_page_cache_started'):
+            return response
+        tags = stop_collecting()
+        key = request._page_cache_key
+        if key and tags and is_cacheable_response(request, response):
+            set_cached_page(
+                key, tags, response, request._page_cache_started)
+        return response
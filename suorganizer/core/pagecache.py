@@ -0,0 +1,265 @@
+import threading
+import time
+from datetime import date
+from hashlib import md5
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db.models import ForeignKey, Model, QuerySet
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save)
+from django.utils.encoding import force_bytes, force_text
+
+from .signals import post_bulk_load
+from .utils import model_label
+
+_collector = threading.local()
+
+
+def get_page_cache_timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+
+def get_page_cache_models():
+    return [apps.get_model(label)
+            for label in getattr(settings, 'PAGE_CACHE_MODELS', ())]
+
+
+def collection_tag(model):
+    return model_label(model)
+
+
+def instance_tag(model, pk):
+    return '{}:{}'.format(model_label(model), pk)
+
+
+def tag_key(tag):
+    return 'page_tag:{}'.format(tag)
+
+
+def page_key(request):
+    return 'page_cache:{}:{}'.format(
+        date.today().isoformat(),
+        md5(force_bytes(request.build_absolute_uri())).hexdigest())
+
+
+def get_tag_versions(tags, default):
+    keys = {tag_key(tag): tag for tag in tags}
+    versions = cache.get_many(list(keys))
+    missing = set(keys) - set(versions)
+    if missing:
+        for key in missing:
+            cache.add(key, default, None)
+        versions.update(cache.get_many(list(missing)))
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def purge_tags(tags):
+    stamp = time.time()
+    cache.set_many(
+        {tag_key(tag): stamp for tag in tags}, None)
+
+
+def permission_signature(user, perms):
+    granted = sorted(
+        perm for perm in set(perms)
+        if user is not None and user.has_perm(perm))
+    return md5(force_bytes(' '.join(granted))).hexdigest()[:12]
+
+
+def fragment_dependencies(values):
+    parts = []
+    tags = set()
+    for value in values:
+        if isinstance(value, (list, tuple, QuerySet)):
+            members = list(value)
+        else:
+            members = [value]
+        for member in members:
+            if isinstance(member, Model):
+                tag = instance_tag(
+                    member._meta.concrete_model, member.pk)
+                tags.add(tag)
+                parts.append(tag)
+            else:
+                parts.append(force_text(member))
+        parts.append('|')
+    return parts, tags
+
+
+def fragment_key(fragment_name, parts, signature):
+    return 'fragment_cache:{}:{}:{}'.format(
+        fragment_name, signature,
+        md5(force_bytes(' '.join(parts))).hexdigest())
+
+
+def is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if CookieStorage.cookie_name in request.COOKIES:
+        return False
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return not request.user.is_authenticated()
+    return True
+
+
+def is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_USED')
+        and not response.has_header('ETag')
+        and 'private' not in response.get('Cache-Control', ''))
+
+
+def get_tagged(key):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    versions = cache.get_many([tag_key(tag) for tag in entry[0]])
+    for tag, version in entry[0].items():
+        if versions.get(tag_key(tag)) != version:
+            return None
+    return entry
+
+
+def set_tagged(key, tags, value, started, timeout):
+    versions = get_tag_versions(tags, started)
+    if (len(versions) != len(tags)
+            or any(version > started for version in versions.values())):
+        return False
+    cache.set(key, (versions, value), timeout)
+    return True
+
+
+def get_cached_page(key):
+    entry = get_tagged(key)
+    if entry is None:
+        return None
+    return entry[1]
+
+
+def set_cached_page(key, tags, response, started):
+    return set_tagged(
+        key, tags, response, started, get_page_cache_timeout())
+
+
+def start_collecting(reset=False):
+    started = time.time()
+    stack = getattr(_collector, 'stack', None)
+    if reset or stack is None:
+        stack = _collector.stack = []
+    stack.append((started, set()))
+    return started
+
+
+def stop_collecting():
+    stack = getattr(_collector, 'stack', None)
+    if not stack:
+        return set()
+    return stack.pop()[1]
+
+
+def collection_started():
+    stack = getattr(_collector, 'stack', None)
+    if not stack:
+        return None
+    return stack[0][0]
+
+
+def tag_page(*tags):
+    for started, collected in getattr(_collector, 'stack', ()):
+        collected.update(tags)
+
+
+def collect_instance(sender, instance, **kwargs):
+    if instance.pk is not None:
+        tag_page(instance_tag(sender, instance.pk))
+
+
+def parent_tags(instance, models):
+    for field in instance._meta.concrete_fields:
+        if isinstance(field, ForeignKey) and field.rel.to in models:
+            pk = getattr(instance, field.attname)
+            if pk is not None:
+                yield instance_tag(field.rel.to, pk)
+
+
+def instance_tags(sender, instance):
+    tags = {instance_tag(sender, instance.pk)}
+    tags.update(parent_tags(instance, get_page_cache_models()))
+    return tags
+
+
+def purge_saved(sender, instance, created, **kwargs):
+    tags = instance_tags(sender, instance)
+    if created:
+        tags.add(collection_tag(sender))
+    purge_tags(tags)
+
+
+def purge_deleted(sender, instance, **kwargs):
+    tags = instance_tags(sender, instance)
+    tags.add(collection_tag(sender))
+    purge_tags(tags)
+
+
+def purge_relation(sender, instance, action, model, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    tags = {collection_tag(sender),
+            instance_tag(type(instance), instance.pk)}
+    tags.update(instance_tag(model, pk) for pk in pk_set or ())
+    purge_tags(tags)
+
+
+def purge_loaded(sender, instances, **kwargs):
+    models = get_page_cache_models()
+    tags = {collection_tag(sender)}
+    for instance in instances:
+        if instance.pk is not None:
+            tags.add(instance_tag(sender, instance.pk))
+            tags.update(parent_tags(instance, models))
+    purge_tags(tags)
+
+
+def connect_signals():
+    models = get_page_cache_models()
+    for model in models:
+        label = model_label(model)
+        post_init.connect(
+            collect_instance, sender=model,
+            dispatch_uid='page_cache_collect_{}'.format(label))
+        post_save.connect(
+            purge_saved, sender=model,
+            dispatch_uid='page_cache_save_{}'.format(label))
+        post_delete.connect(
+            purge_deleted, sender=model,
+            dispatch_uid='page_cache_delete_{}'.format(label))
+        post_bulk_load.connect(
+            purge_loaded, sender=model,
+            dispatch_uid='page_cache_load_{}'.format(label))
+        for field in model._meta.many_to_many:
+            if field.rel.to in models:
+                through = field.rel.through
+                m2m_changed.connect(
+                    purge_relation, sender=through,
+                    dispatch_uid='page_cache_m2m_{}'.format(
+                        model_label(through)))
+
+
+class PageCacheListMixin:
+    page_cache_models = ()
+
+    def get_page_cache_models(self):
+        return self.page_cache_models
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        tag_page(*[
+            collection_tag(model) for model in
+            (queryset.model,) + tuple(self.get_page_cache_models())])
+        return queryset
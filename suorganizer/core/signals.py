@@ -0,0 +1,3 @@
+from django.dispatch import Signal
+
+post_bulk_load = Signal(providing_args=['instances', 'using'])
@@ -0,0 +1,204 @@
+import glob
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db.models import ExpressionWrapper, F, IntegerField, Max
+from django.utils.module_loading import import_string
+
+SHARD_SIZE = 50000
+
+URLSET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+URLSET_FOOTER = '</urlset>\n'
+INDEX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex '
+    'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+INDEX_FOOTER = '</sitemapindex>\n'
+
+
+def get_sitemaps():
+    return [import_string(path)
+            for path in getattr(settings, 'SITEMAPS', ())]
+
+
+def get_sitemap_cache_dir(day=None):
+    return os.path.join(
+        settings.SITEMAP_CACHE_DIR,
+        (day or date.today()).isoformat())
+
+
+def get_site_root():
+    protocol = getattr(settings, 'SITEMAP_PROTOCOL', 'http')
+    return '{}://{}'.format(protocol, Site.objects.get_current().domain)
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def remove_stale_dirs(keep=None):
+    keep = os.path.basename(keep or get_sitemap_cache_dir())
+    root = settings.SITEMAP_CACHE_DIR
+    if not os.path.isdir(root):
+        return
+    for name in os.listdir(root):
+        if name != keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def get_sitemap_stamp(name):
+    return cache.get('sitemap_stamp:{}'.format(name))
+
+
+def touch_sitemap_stamp(name):
+    stamp = time.time()
+    cache.set('sitemap_stamp:{}'.format(name), stamp, None)
+    return stamp
+
+
+def write_through(path, chunks, stamp=None):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    expected = stamp and get_sitemap_stamp(stamp)
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+    complete = False
+    try:
+        with open(fd, 'w', encoding='utf-8') as stream:
+            for chunk in chunks:
+                stream.write(chunk)
+                yield chunk
+        if not stamp or get_sitemap_stamp(stamp) == expected:
+            os.replace(temp_path, path)
+            complete = True
+    finally:
+        if not complete:
+            remove_file(temp_path)
+
+
+class ShardedSitemap:
+    section = ''
+    model = None
+    row_fields = ()
+    changefreq = None
+    priority = None
+    shard_size = SHARD_SIZE
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_row_queryset(self):
+        return self.get_queryset()
+
+    def shard_aggregates(self):
+        return {}
+
+    def shard_lastmod(self, values):
+        return values.get('lastmod')
+
+    def location(self, row):
+        raise NotImplementedError
+
+    def lastmod(self, row):
+        return None
+
+    def rows(self, shard=None):
+        queryset = self.get_row_queryset()
+        if shard is not None:
+            queryset = queryset.filter(
+                pk__gte=shard * self.shard_size,
+                pk__lt=(shard + 1) * self.shard_size)
+        return (
+            queryset
+            .order_by('pk')
+            .values_list('pk', *self.row_fields)
+            .iterator())
+
+    def shards(self):
+        queryset = (
+            self.get_queryset()
+            .annotate(shard=ExpressionWrapper(
+                F('pk') / self.shard_size, output_field=IntegerField()))
+            .values('shard')
+            .annotate(**self.shard_aggregates())
+            .order_by('shard'))
+        return [
+            (values['shard'], self.shard_lastmod(values))
+            for values in queryset]
+
+    def has_shard(self, shard):
+        last = self.get_queryset().aggregate(last=Max('pk'))['last']
+        if last is None or not 0 <= shard <= last // self.shard_size:
+            return False
+        return self.get_queryset().filter(
+            pk__gte=shard * self.shard_size,
+            pk__lt=(shard + 1) * self.shard_size).exists()
+
+    def render_shard(self, shard, root):
+        yield URLSET_HEADER
+        for row in self.rows(shard):
+            parts = ['<url><loc>{}</loc>'.format(
+                escape(root + self.location(row)))]
+            lastmod = self.lastmod(row)
+            if lastmod is not None:
+                parts.append(
+                    '<lastmod>{}</lastmod>'.format(lastmod.isoformat()))
+            if self.changefreq:
+                parts.append(
+                    '<changefreq>{}</changefreq>'.format(self.changefreq))
+            if self.priority is not None:
+                parts.append(
+                    '<priority>{:.1f}</priority>'.format(self.priority))
+            parts.append('</url>\n')
+            yield ''.join(parts)
+        yield URLSET_FOOTER
+
+    def shard_path(self, shard, day=None):
+        return os.path.join(
+            get_sitemap_cache_dir(day),
+            '{}-{}.xml'.format(self.section, shard))
+
+    @classmethod
+    def invalidate(cls, pks=None):
+        sitemap = cls()
+        touch_sitemap_stamp(sitemap.section)
+        touch_sitemap_stamp('index')
+        if pks is None:
+            paths = glob.glob(sitemap.shard_path('*'))
+        else:
+            paths = [
+                sitemap.shard_path(shard) for shard in
+                {pk // sitemap.shard_size for pk in pks}]
+        for path in paths:
+            remove_file(path)
+        remove_file(index_path())
+
+
+def index_path(day=None):
+    return os.path.join(get_sitemap_cache_dir(day), 'index.xml')
+
+
+def render_index(sitemaps, shard_url, root):
+    yield INDEX_HEADER
+    for sitemap_class in sitemaps:
+        sitemap = sitemap_class()
+        for shard, lastmod in sitemap.shards():
+            parts = ['<sitemap><loc>{}</loc>'.format(
+                escape(root + shard_url(sitemap.section, shard)))]
+            if lastmod is not None:
+                parts.append(
+                    '<lastmod>{}</lastmod>'.format(lastmod.isoformat()))
+            parts.append('</sitemap>\n')
+            yield ''.join(parts)
+    yield INDEX_FOOTER
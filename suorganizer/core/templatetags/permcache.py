@@ -0,0 +1,67 @@
+from django import template
+
+from ..pagecache import (
+    collection_started, fragment_dependencies, fragment_key,
+    get_page_cache_timeout, get_tagged, permission_signature,
+    set_tagged, start_collecting, stop_collecting, tag_page)
+
+register = template.Library()
+
+
+class PermCacheNode(template.Node):
+
+    def __init__(self, nodelist, fragment_name, vary_on,
+                 perms=None, timeout=None):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+        self.perms = perms
+        self.timeout = timeout
+
+    def render(self, context):
+        perms = ()
+        if self.perms is not None:
+            perms = self.perms.resolve(context).split()
+        timeout = get_page_cache_timeout()
+        if self.timeout is not None:
+            timeout = int(self.timeout.resolve(context))
+        parts, tags = fragment_dependencies(
+            [expr.resolve(context) for expr in self.vary_on])
+        key = fragment_key(
+            self.fragment_name.resolve(context), parts,
+            permission_signature(context.get('user'), perms))
+        entry = get_tagged(key)
+        if entry is not None:
+            tag_page(*entry[0])
+            return entry[1]
+        started = collection_started()
+        fragment_started = start_collecting()
+        try:
+            output = self.nodelist.render(context)
+        finally:
+            tags.update(stop_collecting())
+        set_tagged(key, tags, output,
+                   started or fragment_started, timeout)
+        return output
+
+
+@register.tag
+def permcache(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            "'{}' tag requires a fragment name.".format(bits[0]))
+    nodelist = parser.parse(('endpermcache',))
+    parser.delete_first_token()
+    args = []
+    kwargs = {}
+    for bit in bits[1:]:
+        name, _, value = bit.partition('=')
+        if value and name in ('perms', 'timeout'):
+            kwargs[name] = parser.compile_filter(value)
+        else:
+            args.append(parser.compile_filter(bit))
+    if not args:
+        raise template.TemplateSyntaxError(
+            "'{}' tag requires a fragment name.".format(bits[0]))
+    return PermCacheNode(nodelist, args[0], args[1:], **kwargs)
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from organizer.models import Startup, Tag
+
+from .fixtures import FixtureDumper
+
+
+class BulkLoadDataTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'startups.jsonl')
+        records = [
+            {'model': 'organizer.tag',
+             'fields': {'name': 'fx tag {}'.format(i),
+                        'slug': 'fx-tag-{}'.format(i)}}
+            for i in range(20)]
+        records.extend(
+            {'model': 'organizer.startup',
+             'fields': {
+                 'name': 'Fx Startup {}'.format(i),
+                 'slug': 'fx-startup-{}'.format(i),
+                 'description': 'Fixture startup.',
+                 'founded_date': '2015-01-01',
+                 'contact': 'fx@example.com',
+                 'website': 'http://example.com/',
+                 'tags': [['fx-tag-{}'.format(j)]
+                          for j in range(i, i + 6)]}}
+            for i in range(14))
+        with open(self.path, 'w') as stream:
+            for record in records:
+                stream.write(json.dumps(record) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def load(self, **options):
+        call_command(
+            'bulkloaddata', self.path, stdout=StringIO(), **options)
+
+    def assert_loaded(self):
+        self.assertEqual(Tag.objects.count(), 20)
+        for i in range(14):
+            startup = Startup.objects.get(slug='fx-startup-{}'.format(i))
+            self.assertEqual(
+                sorted(startup.tags.values_list('slug', flat=True)),
+                sorted('fx-tag-{}'.format(j) for j in range(i, i + 6)))
+
+    def test_load(self):
+        self.load()
+        self.assert_loaded()
+
+    def test_load_with_small_key_cache(self):
+        self.load(chunk_size=5, cache_size=12)
+        self.assert_loaded()
+
+
+class BulkDumpDataTests(TestCase):
+
+    def setUp(self):
+        tags = [
+            Tag.objects.create(
+                name='dump tag {}'.format(i), slug='dump-tag-{}'.format(i))
+            for i in range(12)]
+        for i in range(6):
+            startup = Startup.objects.create(
+                name='Dump Startup {}'.format(i),
+                slug='dump-startup-{}'.format(i),
+                description='Dumped startup.',
+                founded_date='2015-01-01',
+                contact='dump@example.com',
+                website='http://example.com/')
+            startup.tags.add(*tags[i:i + 6])
+
+    def dump(self, **options):
+        stream = StringIO()
+        FixtureDumper(**options).dump([Startup], stream, 'jsonl')
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_dump_with_small_key_cache(self):
+        records = self.dump(chunk_size=2, cache_size=8)
+        self.assertEqual(records, self.dump())
+        self.assertEqual(
+            [sorted(record['fields']['tags']) for record in records],
+            [sorted(['dump-tag-{}'.format(j)] for j in range(i, i + 6))
+             for i in range(6)])
@@ -1,5 +1,211 @@
+import csv
+import json
+import re
+import time
+from hashlib import md5
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.urlresolvers import (
+    get_resolver, get_script_prefix, get_urlconf, reverse)
+from django.db import DatabaseError, connections
+from django.db.models.sql.datastructures import EmptyResultSet
+from django.utils.encoding import force_bytes, force_text
+from django.utils.http import RFC3986_SUBDELIMS, urlquote
+from django.utils.regex_helper import normalize
+from django.utils.functional import cached_property
 from django.views.generic import UpdateView as BaseUpdateView
 
 
 class UpdateView(BaseUpdateView):
-    template_name_suffix = '_form_update'
\ No newline at end of file
+    template_name_suffix = '_form_update'
+
+
+_url_templates = {}
+
+
+def _url_template(resolver, prefix, viewname, params):
+    prefix_norm = normalize(urlquote(prefix))[0][0]
+    for possibility, pattern, defaults in (
+            resolver.reverse_dict.getlist(viewname)):
+        if defaults:
+            continue
+        for result, result_params in possibility:
+            if set(result_params) == params:
+                return (
+                    prefix_norm.replace('%', '%%') + result,
+                    re.compile('^%s%s' % (prefix_norm, pattern),
+                               re.UNICODE))
+    return None
+
+
+def fast_reverse(viewname, kwargs):
+    resolver = get_resolver(get_urlconf())
+    prefix = get_script_prefix()
+    params = frozenset(kwargs)
+    key = (resolver, prefix, viewname, params)
+    try:
+        template = _url_templates[key]
+    except KeyError:
+        template = _url_templates[key] = _url_template(
+            resolver, prefix, viewname, params)
+    if template is None:
+        return reverse(viewname, kwargs=kwargs)
+    candidate, regex = template
+    subs = {k: force_text(v) for k, v in kwargs.items()}
+    if not regex.search(candidate % subs):
+        return reverse(viewname, kwargs=kwargs)
+    url = candidate % {
+        k: urlquote(v, safe=RFC3986_SUBDELIMS + '/~:@')
+        for k, v in subs.items()}
+    if url.startswith('//'):
+        url = '/%%2F%s' % url[2:]
+    return url
+
+
+class CachedUrlMixin():
+
+    def cached_url(self, viewname, **kwargs):
+        key = (viewname, tuple(sorted(kwargs.items())))
+        urls = self.__dict__.setdefault('_url_cache', {})
+        try:
+            return urls[key]
+        except KeyError:
+            url = urls[key] = fast_reverse(viewname, kwargs)
+            return url
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def guess_record_format(path):
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'lines'
+
+
+def read_records(stream, record_format='lines'):
+    if record_format == 'csv':
+        for row in csv.DictReader(stream):
+            yield row
+    elif record_format == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def model_label(model):
+    return '{}.{}'.format(
+        model._meta.app_label, model._meta.model_name)
+
+
+def get_model_stamp(model):
+    key = 'model_stamp:{}'.format(model_label(model))
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, time.time(), None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def touch_model_stamp(model):
+    key = 'model_stamp:{}'.format(model_label(model))
+    stamp = time.time()
+    cache.set(key, stamp, None)
+    return stamp
+
+
+def estimate_row_count(model, using='default'):
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = (
+            'SELECT reltuples FROM pg_class '
+            'WHERE relname = %s AND relkind = \'r\' '
+            'AND pg_table_is_visible(oid)')
+    elif connection.vendor == 'mysql':
+        sql = (
+            'SELECT table_rows FROM information_schema.tables '
+            'WHERE table_schema = DATABASE() '
+            'AND table_name = %s')
+    elif connection.vendor == 'sqlite':
+        if 'sqlite_stat1' not in (
+                connection.introspection.table_names()):
+            return None
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s'
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None or row[0] is None:
+        return None
+    try:
+        estimate = int(float(str(row[0]).split()[0]))
+    except (IndexError, ValueError):
+        return None
+    if estimate < 0:
+        return None
+    return estimate
+
+
+class CachedCountPaginator(Paginator):
+    cache_timeout = 300
+
+    def __init__(self, *args, **kwargs):
+        self.approximate_threshold = kwargs.pop(
+            'approximate_threshold',
+            getattr(settings,
+                    'PAGINATOR_APPROXIMATE_THRESHOLD', None))
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return len(queryset)
+        if (self.approximate_threshold is not None
+                and not queryset.query.has_filters()):
+            estimate_key = 'paginator_estimate:{}'.format(
+                model_label(queryset.model))
+            estimate = cache.get(estimate_key)
+            if estimate is None:
+                estimate = estimate_row_count(
+                    queryset.model, queryset.db)
+                cache.set(
+                    estimate_key, estimate, self.cache_timeout)
+            if (estimate is not None
+                    and estimate >= self.approximate_threshold):
+                return estimate
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return 0
+        key = 'paginator_count:{label}:{stamp}:{digest}'.format(
+            label=model_label(queryset.model),
+            stamp=get_model_stamp(queryset.model),
+            digest=md5(force_bytes(sql)).hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.cache_timeout)
+        return count
@@ -0,0 +1,62 @@
+import os
+
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.views.generic import View
+
+from .sitemaps import (
+    get_site_root, get_sitemaps, index_path, render_index,
+    write_through)
+from .utils import fast_reverse
+
+
+def sitemap_response(path, render, stamp):
+    try:
+        return FileResponse(
+            open(path, 'rb'), content_type='application/xml')
+    except FileNotFoundError:
+        return StreamingHttpResponse(
+            write_through(path, render(), stamp),
+            content_type='application/xml')
+
+
+def shard_url(section, shard):
+    return fast_reverse(
+        'sitemap_shard', {'section': section, 'shard': shard})
+
+
+class SitemapMixin:
+    sitemaps = None
+
+    def get_sitemaps(self):
+        if self.sitemaps is None:
+            return get_sitemaps()
+        return self.sitemaps
+
+
+class SitemapIndex(SitemapMixin, View):
+
+    def get(self, request):
+        return sitemap_response(
+            index_path(),
+            lambda: render_index(
+                self.get_sitemaps(), shard_url, get_site_root()),
+            'index')
+
+
+class SitemapShard(SitemapMixin, View):
+
+    def get(self, request, section, shard):
+        for sitemap_class in self.get_sitemaps():
+            if sitemap_class.section == section:
+                break
+        else:
+            raise Http404('No sitemap section {}.'.format(section))
+        sitemap = sitemap_class()
+        shard = int(shard)
+        path = sitemap.shard_path(shard)
+        if not os.path.exists(path) and not sitemap.has_shard(shard):
+            raise Http404('No sitemap shard {}-{}.'.format(section, shard))
+        return sitemap_response(
+            path,
+            lambda: sitemap.render_shard(shard, get_site_root()),
+            sitemap.section)
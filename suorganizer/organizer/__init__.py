@@ -0,0 +1 @@
+default_app_config = 'organizer.apps.OrganizerConfig'
\ No newline at end of file
@@ -1,7 +1,18 @@
 from django.contrib import admin
 
+from search.utils import SearchIndexAdminMixin
+
 from .models import NewsLink, Startup, Tag
 
 admin.site.register(NewsLink)
-admin.site.register(Startup)
-admin.site.register(Tag)
\ No newline at end of file
+
+
+@admin.register(Startup)
+class StartupAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'founded_date')
+    search_fields = ('name', 'description')
+
+
+@admin.register(Tag)
+class TagAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
+    search_fields = ('name',)
@@ -0,0 +1,57 @@
+from bisect import bisect_left
+
+from core.utils import get_model_stamp
+
+from .models import Tag
+
+
+def name_keys(name):
+    words = name.lower().split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class TagIndex:
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.tags = {}
+        entries = set()
+        for pk, name, slug in rows:
+            self.tags[pk] = (name, slug)
+            entries.add((slug, pk))
+            entries.update((key, pk) for key in name_keys(name))
+        self.entries = sorted(entries)
+        self.keys = [key for key, pk in self.entries]
+
+    def __len__(self):
+        return len(self.tags)
+
+    def search(self, prefix, limit=10):
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix or limit < 1:
+            return []
+        found = []
+        seen = set()
+        for i in range(bisect_left(self.keys, prefix), len(self.keys)):
+            key, pk = self.entries[i]
+            if not key.startswith(prefix):
+                break
+            if pk not in seen:
+                seen.add(pk)
+                found.append(self.tags[pk])
+                if len(found) == limit:
+                    break
+        return found
+
+
+_tag_index = None
+
+
+def get_tag_index():
+    global _tag_index
+    version = get_model_stamp(Tag)
+    index = _tag_index
+    if index is None or index.version != version:
+        rows = Tag.objects.values_list('pk', 'name', 'slug').iterator()
+        index = _tag_index = TagIndex(rows, version)
+    return index
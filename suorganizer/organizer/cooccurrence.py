@@ -0,0 +1,88 @@
+from collections import Counter
+from heapq import nlargest
+from itertools import groupby, permutations
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+
+from blog.models import Post
+
+from .models import RelatedTag, Startup
+
+
+def get_top_k():
+    return getattr(settings, 'RELATED_TAGS_TOP_K', 10)
+
+
+def tag_sources():
+    return (
+        (Startup.tags.through, 'startup_id'),
+        (Post.tags.through, 'post_id'),
+    )
+
+
+def count_pairs(rows, counts, tag_ids=None):
+    for owner, group in groupby(rows, key=itemgetter(0)):
+        owner_tags = [tag_id for _, tag_id in group]
+        for tag_id, related_id in permutations(owner_tags, 2):
+            if tag_ids is None or tag_id in tag_ids:
+                counts[tag_id, related_id] += 1
+    return counts
+
+
+def save_neighbours(counts, tag_ids=None):
+    by_tag = {}
+    for (tag_id, related_id), weight in counts.items():
+        by_tag.setdefault(tag_id, []).append((weight, related_id))
+    top_k = get_top_k()
+    neighbours = [
+        RelatedTag(tag_id=tag_id, related_id=related_id, weight=weight)
+        for tag_id, pairs in by_tag.items()
+        for weight, related_id in nlargest(top_k, pairs)]
+    with transaction.atomic():
+        if tag_ids is None:
+            RelatedTag.objects.all().delete()
+        else:
+            RelatedTag.objects.filter(tag_id__in=tag_ids).delete()
+        RelatedTag.objects.bulk_create(neighbours, batch_size=500)
+    return len(neighbours)
+
+
+def rebuild_related_tags():
+    counts = Counter()
+    for through, owner_field in tag_sources():
+        rows = (
+            through.objects
+            .order_by(owner_field)
+            .values_list(owner_field, 'tag_id')
+            .iterator())
+        count_pairs(rows, counts)
+    return save_neighbours(counts)
+
+
+def refresh_related_tags(tag_ids):
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return 0
+    counts = Counter()
+    for through, owner_field in tag_sources():
+        owners = (
+            through.objects
+            .filter(tag_id__in=tag_ids)
+            .values(owner_field))
+        rows = (
+            through.objects
+            .filter(**{owner_field + '__in': owners})
+            .order_by(owner_field)
+            .values_list(owner_field, 'tag_id')
+            .iterator())
+        count_pairs(rows, counts, tag_ids)
+    return save_neighbours(counts, tag_ids)
+
+
+def affected_tag_ids(through, owner_field, owner_ids):
+    return set(
+        through.objects
+        .filter(**{owner_field + '__in': owner_ids})
+        .values_list('tag_id', flat=True))
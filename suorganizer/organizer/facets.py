@@ -0,0 +1,249 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import connection
+
+from core.utils import get_model_stamp
+
+from .models import Startup, Tag
+
+# A tag with fewer members than size / SPARSE_RATIO keeps a sorted
+# array of 4-byte ranks, which is smaller than a bitmap of the list.
+SPARSE_RATIO = 32
+
+
+def facets_version():
+    return (get_model_stamp(Startup), get_model_stamp(Tag))
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+def bitmap(ranks, size):
+    data = bytearray(size // 8 + 1)
+    for rank in ranks:
+        data[rank >> 3] |= 1 << (rank & 7)
+    return int.from_bytes(bytes(data), 'little')
+
+
+class StartupFacets:
+
+    def __init__(self, startup_ids, tags, pairs, version=None):
+        self.version = version
+        self.startup_ids = array('q', startup_ids)
+        self.size = len(self.startup_ids)
+        self.ranks = {
+            pk: rank for rank, pk in enumerate(self.startup_ids)}
+        self.tags = {pk: (name, slug) for pk, name, slug in tags}
+        self.tag_ids = {
+            slug: pk for pk, (name, slug) in self.tags.items()}
+        self.members = {}
+        for tag_id, group in groupby(pairs, key=itemgetter(0)):
+            self.members[tag_id] = self.pack(sorted(
+                self.ranks[startup_id] for _, startup_id in group))
+        self.sizes = {
+            tag_id: self.member_count(members)
+            for tag_id, members in self.members.items()}
+
+    def pack(self, ranks):
+        if len(ranks) * SPARSE_RATIO > self.size:
+            return bitmap(ranks, self.size)
+        return array('i', ranks)
+
+    def as_bits(self, members):
+        if isinstance(members, int):
+            return members
+        return bitmap(members, self.size)
+
+    def member_count(self, members):
+        if isinstance(members, int):
+            return popcount(members)
+        return len(members)
+
+    def has_rank(self, members, rank):
+        if isinstance(members, int):
+            return bool(members >> rank & 1)
+        index = bisect_left(members, rank)
+        return index < len(members) and members[index] == rank
+
+    def match(self, tag_ids, mode='all'):
+        if not tag_ids:
+            return (1 << self.size) - 1
+        sets = [
+            self.as_bits(self.members.get(tag_id, 0))
+            for tag_id in tag_ids]
+        bits = sets[0]
+        for member_bits in sets[1:]:
+            if mode == 'any':
+                bits |= member_bits
+            else:
+                bits &= member_bits
+        return bits
+
+    def matching_ids(self, bits):
+        ranks = bin(bits)[:1:-1]
+        return [self.startup_ids[match.start()]
+                for match in re.finditer('1', ranks)]
+
+    def counts(self, bits=None):
+        if bits is None:
+            return {
+                tag_id: size
+                for tag_id, size in self.sizes.items() if size}
+        counts = {}
+        data = bits.to_bytes(self.size // 8 + 1, 'little')
+        for tag_id, members in self.members.items():
+            if isinstance(members, int):
+                count = popcount(members & bits)
+            else:
+                count = sum(
+                    data[rank >> 3] >> (rank & 7) & 1
+                    for rank in members)
+            if count:
+                counts[tag_id] = count
+        return counts
+
+    def _link(self, startup_id, tag_id, add):
+        rank = self.ranks[startup_id]
+        if tag_id not in self.tags:
+            raise KeyError(tag_id)
+        members = self.members.get(tag_id, array('i'))
+        if isinstance(members, int):
+            if add:
+                members |= 1 << rank
+            else:
+                members &= ~(1 << rank)
+        else:
+            index = bisect_left(members, rank)
+            present = (
+                index < len(members) and members[index] == rank)
+            if add and not present:
+                members.insert(index, rank)
+            elif not add and present:
+                del members[index]
+            if len(members) * SPARSE_RATIO > self.size:
+                members = bitmap(members, self.size)
+        self.members[tag_id] = members
+        self.sizes[tag_id] = self.member_count(members)
+
+    def apply(self, action, instance, reverse, pk_set):
+        if action == 'post_clear':
+            if reverse:
+                pairs = [
+                    (startup_id, instance.pk)
+                    for startup_id in self.matching_ids(self.as_bits(
+                        self.members.get(instance.pk, 0)))]
+            else:
+                rank = self.ranks[instance.pk]
+                pairs = [
+                    (instance.pk, tag_id)
+                    for tag_id, members in self.members.items()
+                    if self.has_rank(members, rank)]
+            add = False
+        else:
+            if reverse:
+                pairs = [(pk, instance.pk) for pk in pk_set]
+            else:
+                pairs = [(instance.pk, pk) for pk in pk_set]
+            add = action == 'post_add'
+        for startup_id, tag_id in pairs:
+            self._link(startup_id, tag_id, add)
+
+
+def build_startup_facets(version=None):
+    startup_ids = (
+        Startup.objects
+        .order_by('name', 'pk')
+        .values_list('pk', flat=True))
+    tags = Tag.objects.values_list('pk', 'name', 'slug')
+    pairs = (
+        Startup.tags.through.objects
+        .order_by('tag_id')
+        .values_list('tag_id', 'startup_id')
+        .iterator())
+    return StartupFacets(startup_ids, tags, pairs, version)
+
+
+_startup_facets = None
+_facets_lock = threading.Lock()
+_rebuilding = False
+
+
+def rebuild_startup_facets():
+    global _startup_facets, _rebuilding
+    try:
+        while True:
+            facets = build_startup_facets(facets_version())
+            with _facets_lock:
+                _startup_facets = facets
+                if facets.version == facets_version():
+                    break
+    finally:
+        with _facets_lock:
+            _rebuilding = False
+        connection.close()
+
+
+def get_startup_facets():
+    global _startup_facets, _rebuilding
+    facets = _startup_facets
+    if facets is None:
+        with _facets_lock:
+            if _startup_facets is None:
+                _startup_facets = build_startup_facets(
+                    facets_version())
+            return _startup_facets
+    if facets.version != facets_version():
+        with _facets_lock:
+            start, _rebuilding = not _rebuilding, True
+        if start:
+            threading.Thread(
+                target=rebuild_startup_facets, daemon=True).start()
+    return facets
+
+
+def current_startup_facets():
+    facets = _startup_facets
+    if facets is not None and facets.version == facets_version():
+        return facets
+    return None
+
+
+def update_startup_facets(facets, action, instance, reverse, pk_set):
+    if facets is None:
+        return
+    with _facets_lock:
+        if facets is not _startup_facets:
+            return
+        try:
+            facets.apply(action, instance, reverse, pk_set)
+        except KeyError:
+            facets.version = None
+        else:
+            facets.version = facets_version()
+
+
+class FacetResults:
+    model = Startup
+
+    def __init__(self, facets, bits, queryset):
+        self.ids = facets.matching_ids(bits)
+        self.queryset = queryset
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        ids = self.ids[index]
+        objects = self.queryset.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
@@ -0,0 +1,56 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from blog.feeds import BasePostFeedMixin
+from core.feeds import CachedFeedMixin
+
+from .models import Startup, Tag
+
+
+class RelatedPostFeedMixin(CachedFeedMixin, BasePostFeedMixin):
+    model = None
+    title_format = ''
+
+    def get_object(self, request, slug):
+        return get_object_or_404(self.model, slug=slug)
+
+    def title(self, obj):
+        return self.title_format.format(obj.name)
+
+    def link(self, obj):
+        return obj.get_absolute_url()
+
+    def description(self, obj):
+        return self.title(obj)
+
+    subtitle = description
+
+    def items(self, obj):
+        return self.get_items(obj.blog_posts.all())
+
+
+class TagFeedMixin(RelatedPostFeedMixin):
+    model = Tag
+    title_format = 'Startup Organizer Blog Posts tagged {}'
+
+
+class StartupFeedMixin(RelatedPostFeedMixin):
+    model = Startup
+    title_format = 'Startup Organizer Blog Posts about {}'
+
+
+class AtomTagFeed(TagFeedMixin, Feed):
+    feed_type = Atom1Feed
+
+
+class Rss2TagFeed(TagFeedMixin, Feed):
+    feed_type = Rss201rev2Feed
+
+
+class AtomStartupFeed(StartupFeedMixin, Feed):
+    feed_type = Atom1Feed
+
+
+class Rss2StartupFeed(StartupFeedMixin, Feed):
+    feed_type = Rss201rev2Feed
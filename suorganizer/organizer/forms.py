@@ -6,14 +6,18 @@ from .models import Tag, NewsLink, Startup
 
 
 class SlugCleanMixin:
+    reserved_slugs = ('create',)
 
     def clean_slug(self):
         new_slug = self.cleaned_data['slug'].lower()
-        if new_slug == 'create':
-            raise ValidationError('Slug may not be "create"')
+        if new_slug in self.reserved_slugs:
+            raise ValidationError(
+                'Slug may not be "{}"'.format(new_slug))
         return new_slug
 
 class TagForm(SlugCleanMixin, forms.ModelForm):
+    reserved_slugs = ('create', 'autocomplete')
+
     class Meta:
         model = Tag
         fields = '__all__'
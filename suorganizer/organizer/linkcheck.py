@@ -0,0 +1,69 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+FAILED = 0
+RETRY_STATUSES = {FAILED, 429, 500, 502, 503, 504}
+DEAD_STATUSES = {FAILED, 404, 410}
+BLOCKED_STATUSES = {401, 403, 429}
+
+
+class LinkChecker:
+
+    def __init__(self, concurrency=50, per_host=4, timeout=10.0,
+                 retries=2, backoff=0.5,
+                 user_agent='suorganizer-linkcheck'):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.user_agent = user_agent
+
+    async def fetch_status(self, session, url):
+        async with session.head(
+                url, allow_redirects=True) as response:
+            status = response.status
+        if status in (405, 501):
+            async with session.get(
+                    url, allow_redirects=True) as response:
+                status = response.status
+        return status
+
+    async def check(self, session, url):
+        for attempt in range(self.retries + 1):
+            try:
+                status = await self.fetch_status(session, url)
+            except (aiohttp.ClientError,
+                    asyncio.TimeoutError, ValueError):
+                status = FAILED
+            if status not in RETRY_STATUSES:
+                break
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+        return status
+
+    async def check_all(self, links):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers={'User-Agent': self.user_agent}) as session:
+            statuses = await asyncio.gather(*[
+                self.check(session, url) for key, url in links])
+        return [(key, status)
+                for (key, url), status in zip(links, statuses)]
+
+    def run(self, links):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.check_all(links))
+        finally:
+            loop.close()
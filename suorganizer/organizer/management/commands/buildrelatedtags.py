@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...cooccurrence import rebuild_related_tags
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the related tags (tag co-occurrence) table.'
+
+    def handle(self, **options):
+        start = time.time()
+        total = rebuild_related_tags()
+        self.stdout.write(
+            'Stored {} related tags in {:.2f}s.'.format(
+                total, time.time() - start))
@@ -0,0 +1,122 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from core.pagecache import instance_tag, purge_tags
+from core.utils import touch_model_stamp
+
+from ...linkcheck import (
+    BLOCKED_STATUSES, DEAD_STATUSES, LinkChecker, aiohttp)
+from ...models import NewsLink, Startup
+
+
+class Command(BaseCommand):
+    help = 'Check NewsLink URLs concurrently and store their status.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            dest='concurrency',
+            type=int,
+            default=50,
+            help='Open connections in total.')
+        parser.add_argument(
+            '--per-host',
+            dest='per_host',
+            type=int,
+            default=4,
+            help='Open connections per host.')
+        parser.add_argument(
+            '--timeout',
+            dest='timeout',
+            type=float,
+            default=10.0,
+            help='Seconds allowed per request.')
+        parser.add_argument(
+            '--retries',
+            dest='retries',
+            type=int,
+            default=2,
+            help='Retries for failures, 429 and 5xx responses.')
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Links checked and saved per round.')
+        parser.add_argument(
+            '--max-age',
+            dest='max_age',
+            type=float,
+            default=None,
+            help='Only check links not checked in this many hours.')
+
+    def handle(self, **options):
+        if aiohttp is None:
+            raise CommandError(
+                'checknewslinks needs aiohttp installed.')
+        checker = LinkChecker(
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            timeout=options['timeout'],
+            retries=options['retries'])
+        queryset = NewsLink.objects.order_by('pk')
+        if options['max_age'] is not None:
+            checked_since = timezone.now() - timedelta(
+                hours=options['max_age'])
+            queryset = queryset.filter(
+                Q(link_checked__isnull=True)
+                | Q(link_checked__lt=checked_since))
+        checked = dead = blocked = 0
+        last_pk = 0
+        start = time.time()
+        while True:
+            links = list(
+                queryset
+                .filter(pk__gt=last_pk)
+                .values_list('pk', 'link')[:options['chunk_size']])
+            if not links:
+                break
+            last_pk = links[-1][0]
+            results = checker.run(links)
+            self.save_results(results)
+            checked += len(results)
+            dead += sum(
+                1 for pk, status in results
+                if status in DEAD_STATUSES)
+            blocked += sum(
+                1 for pk, status in results
+                if status in BLOCKED_STATUSES)
+        elapsed = time.time() - start
+        self.stdout.write(
+            'Checked {} links, {} dead, {} refused or rate limited, '
+            'in {:.2f}s ({:.1f} links/s).'.format(
+                checked, dead, blocked, elapsed,
+                checked / elapsed if elapsed else 0))
+
+    def save_results(self, results):
+        checked_at = timezone.now()
+        statuses = dict(results)
+        changed = [
+            (pk, startup_id) for pk, startup_id, status in (
+                NewsLink.objects
+                .filter(pk__in=list(statuses))
+                .values_list('pk', 'startup_id', 'link_status'))
+            if status != statuses[pk]]
+        pks_by_status = {}
+        for pk, status in results:
+            pks_by_status.setdefault(status, []).append(pk)
+        for status, pks in pks_by_status.items():
+            NewsLink.objects.filter(pk__in=pks).update(
+                link_status=status,
+                link_checked=checked_at)
+        if changed:
+            touch_model_stamp(NewsLink)
+            tags = set()
+            for pk, startup_id in changed:
+                tags.add(instance_tag(NewsLink, pk))
+                tags.add(instance_tag(Startup, startup_id))
+            purge_tags(tags)
@@ -1,17 +1,136 @@
+import sys
+import time
+
 from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils.text import slugify
 
+from core.signals import post_bulk_load
+from core.utils import (
+    chunked, guess_record_format, read_records, touch_model_stamp)
+
+from ...forms import TagForm
 from ...models import Tag
 
 class Command(BaseCommand):
-    help = 'Create new Tag.'
+    help = 'Create new Tag, or many Tags from a file.'
 
     def add_arguments(self, parser):
         parser.add_argument(
             'tag_name',
+            nargs='?',
             default=None,
             help='New tag name.')
+        parser.add_argument(
+            '--file',
+            dest='file',
+            default=None,
+            help='Read tag names from a file ("-" for stdin).')
+        parser.add_argument(
+            '--format',
+            dest='format',
+            choices=('lines', 'csv', 'jsonl'),
+            default=None,
+            help=(
+                'Format of --file; guessed from the '
+                'extension by default. CSV and JSONL '
+                'records need a "name" field.'))
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=450,
+            help='Names checked and committed per transaction.')
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=450,
+            help='Rows per INSERT statement.')
 
     def handle(self, **options):
         tag_name = options.pop('tag_name',None)
-        Tag.objects.create(name=tag_name,slug=slugify(tag_name))
\ No newline at end of file
+        path = options.get('file')
+        if path is None:
+            if tag_name is None:
+                raise CommandError(
+                    'Give a tag name or use --file.')
+            Tag.objects.create(name=tag_name,slug=slugify(tag_name))
+            return
+        record_format = (
+            options.get('format')
+            or guess_record_format(path))
+        if path == '-':
+            self.load(sys.stdin, record_format, **options)
+        else:
+            with open(path) as stream:
+                self.load(stream, record_format, **options)
+
+    def clean_record(self, record):
+        if isinstance(record, dict):
+            record = record.get('name') or ''
+        if not isinstance(record, str):
+            return None
+        name = record.strip().lower()
+        slug = slugify(name)
+        name_length = Tag._meta.get_field('name').max_length
+        if (not slug or slug in TagForm.reserved_slugs
+                or len(name) > name_length):
+            return None
+        return (name, slug)
+
+    def load(self, stream, record_format, **options):
+        db = router.db_for_write(Tag)
+        seen_names = set()
+        seen_slugs = set()
+        created = skipped = 0
+        start = time.time()
+        records = read_records(stream, record_format)
+        for chunk in chunked(records, options['chunk_size']):
+            pairs = []
+            for record in chunk:
+                pair = self.clean_record(record)
+                if (pair is None
+                        or pair[0] in seen_names
+                        or pair[1] in seen_slugs):
+                    skipped += 1
+                    continue
+                seen_names.add(pair[0])
+                seen_slugs.add(pair[1])
+                pairs.append(pair)
+            existing = Tag.objects.using(db).annotate(
+                lower_name=Lower('name')
+            ).filter(
+                Q(lower_name__in=[name for name, slug in pairs])
+                | Q(slug__in=[slug for name, slug in pairs])
+            ).values_list('lower_name', 'slug')
+            existing_names = set()
+            existing_slugs = set()
+            for name, slug in existing:
+                existing_names.add(name)
+                existing_slugs.add(slug)
+            new_tags = [
+                Tag(name=name, slug=slug)
+                for name, slug in pairs
+                if name not in existing_names
+                and slug not in existing_slugs]
+            with transaction.atomic(using=db):
+                Tag.objects.using(db).bulk_create(
+                    new_tags, batch_size=options['batch_size'])
+                loaded = list(Tag.objects.using(db).filter(
+                    slug__in=[tag.slug for tag in new_tags]))
+            if loaded:
+                post_bulk_load.send(
+                    sender=Tag, instances=loaded, using=db)
+            created += len(new_tags)
+            skipped += len(pairs) - len(new_tags)
+        if created:
+            touch_model_stamp(Tag)
+        elapsed = time.time() - start
+        self.stdout.write(
+            'Created {} tags, skipped {} in {:.2f}s '
+            '({:.0f} rows/s).'.format(
+                created, skipped, elapsed,
+                (created + skipped) / elapsed if elapsed else 0))
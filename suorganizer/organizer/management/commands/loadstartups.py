@@ -0,0 +1,305 @@
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.signals import post_bulk_load
+from core.utils import (
+    chunked, guess_record_format, read_records, touch_model_stamp)
+
+from ...models import NewsLink, Startup, Tag
+
+
+class Command(BaseCommand):
+    help = 'Upsert Startups, NewsLinks and their Tags from a feed.'
+    newslink_fields = ('title', 'slug', 'pub_date', 'link')
+    startup_fields = (
+        'name', 'slug', 'description',
+        'founded_date', 'contact', 'website')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'feed',
+            help=(
+                'JSONL or CSV feed ("-" for stdin). Records '
+                'are startups unless their "type" is '
+                '"newslink".'))
+        parser.add_argument(
+            '--format',
+            dest='format',
+            choices=('csv', 'jsonl'),
+            default=None,
+            help='Feed format; guessed from the extension by default.')
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=400,
+            help='Records committed per transaction.')
+        parser.add_argument(
+            '--checkpoint',
+            dest='checkpoint',
+            default=None,
+            help='Checkpoint file; defaults to FEED.checkpoint.')
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            dest='restart',
+            default=False,
+            help='Ignore an existing checkpoint.')
+
+    def handle(self, **options):
+        path = options['feed']
+        record_format = options['format']
+        if record_format is None:
+            record_format = guess_record_format(path)
+            if record_format == 'lines':
+                record_format = 'jsonl'
+        if path == '-':
+            checkpoint = None
+        else:
+            checkpoint = (
+                options['checkpoint']
+                or '{}.checkpoint'.format(path))
+        offset = 0
+        if checkpoint is not None and not options['restart']:
+            offset = self.read_checkpoint(checkpoint, path)
+            if offset:
+                self.stdout.write(
+                    'Resuming after record {}.'.format(offset))
+        if path == '-':
+            self.load(sys.stdin, path, record_format, offset,
+                      checkpoint, options['chunk_size'])
+        else:
+            with open(path) as stream:
+                self.load(stream, path, record_format, offset,
+                          checkpoint, options['chunk_size'])
+
+    def read_checkpoint(self, checkpoint, path):
+        try:
+            with open(checkpoint) as stream:
+                data = json.load(stream)
+        except (IOError, ValueError):
+            return 0
+        if data.get('feed') != os.path.abspath(path):
+            raise CommandError(
+                '{} belongs to another feed; use --restart '
+                'or --checkpoint.'.format(checkpoint))
+        return data.get('records', 0)
+
+    def write_checkpoint(self, checkpoint, path, records):
+        temp_path = '{}.tmp'.format(checkpoint)
+        with open(temp_path, 'w') as stream:
+            json.dump({
+                'feed': os.path.abspath(path),
+                'records': records,
+            }, stream)
+        os.replace(temp_path, checkpoint)
+
+    def load(self, stream, path, record_format, offset,
+             checkpoint, chunk_size):
+        self.stats = dict.fromkeys((
+            'startups_created', 'startups_updated',
+            'newslinks_created', 'tag_links_created',
+            'unknown_tags', 'invalid'), 0)
+        processed = offset
+        start = time.time()
+        records = islice(
+            read_records(stream, record_format), offset, None)
+        for chunk in chunked(records, chunk_size):
+            with transaction.atomic():
+                loaded = self.load_chunk(chunk)
+            for model in loaded:
+                touch_model_stamp(model)
+            processed += len(chunk)
+            if checkpoint is not None:
+                self.write_checkpoint(checkpoint, path, processed)
+        if checkpoint is not None and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.time() - start
+        self.stdout.write(
+            'Processed {} records in {:.2f}s ({:.0f} rows/s).'
+            .format(
+                processed - offset, elapsed,
+                (processed - offset) / elapsed if elapsed else 0))
+        for name, value in sorted(self.stats.items()):
+            self.stdout.write('  {}: {}'.format(name, value))
+
+    def clean_fields(self, model, record, field_names):
+        values = {}
+        for name in field_names:
+            value = record.get(name)
+            if value in (None, ''):
+                return None
+            try:
+                values[name] = (
+                    model._meta.get_field(name).to_python(value))
+            except ValidationError:
+                return None
+        return values
+
+    def split_tags(self, tags):
+        if not tags:
+            return []
+        if isinstance(tags, str):
+            tags = tags.split(';')
+        return [tag.strip().lower() for tag in tags if tag.strip()]
+
+    def split_newslinks(self, newslinks):
+        if not newslinks:
+            return []
+        if isinstance(newslinks, str):
+            try:
+                newslinks = json.loads(newslinks)
+            except ValueError:
+                return None
+        if (not isinstance(newslinks, list)
+                or not all(isinstance(newslink, dict)
+                           for newslink in newslinks)):
+            return None
+        return newslinks
+
+    def load_chunk(self, chunk):
+        startups = {}
+        startup_tags = {}
+        newslinks = {}
+        for record in chunk:
+            if record.get('type', 'startup') == 'newslink':
+                values = self.clean_fields(
+                    NewsLink, record, self.newslink_fields)
+                startup_slug = (record.get('startup') or '').lower()
+                if values is None or not startup_slug:
+                    self.stats['invalid'] += 1
+                    continue
+                newslinks[(startup_slug, values['slug'])] = values
+                continue
+            values = self.clean_fields(
+                Startup, record, self.startup_fields)
+            if values is None:
+                self.stats['invalid'] += 1
+                continue
+            startups[values['slug']] = values
+            startup_tags.setdefault(values['slug'], set()).update(
+                self.split_tags(record.get('tags')))
+            nested = self.split_newslinks(record.get('newslinks'))
+            if nested is None:
+                self.stats['invalid'] += 1
+                nested = []
+            for newslink in nested:
+                newslink_values = self.clean_fields(
+                    NewsLink, newslink, self.newslink_fields)
+                if newslink_values is None:
+                    self.stats['invalid'] += 1
+                    continue
+                newslinks[(values['slug'], newslink_values['slug'])] = (
+                    newslink_values)
+        changed_slugs = self.upsert_startups(startups)
+        startup_slugs = set(startups).union(
+            startup_slug for startup_slug, slug in newslinks)
+        startup_ids = dict(
+            Startup.objects
+            .filter(slug__in=startup_slugs)
+            .values_list('slug', 'pk'))
+        linked = self.link_tags(startup_tags, startup_ids)
+        created_newslinks = self.create_newslinks(newslinks, startup_ids)
+        linked_ids = {startup_id for startup_id, tag_id in linked}
+        changed_slugs.update(
+            slug for slug, pk in startup_ids.items() if pk in linked_ids)
+        loaded = []
+        if changed_slugs:
+            self.send_loaded(
+                Startup, Startup.objects.filter(slug__in=changed_slugs))
+            loaded.append(Startup)
+        if linked:
+            self.send_loaded(Tag, Tag.objects.filter(
+                pk__in={tag_id for startup_id, tag_id in linked}))
+            loaded.append(Tag)
+        if created_newslinks:
+            self.send_loaded(NewsLink, [
+                newslink for newslink in NewsLink.objects.filter(
+                    startup_id__in={
+                        startup_id
+                        for startup_id, slug in created_newslinks},
+                    slug__in={
+                        slug for startup_id, slug in created_newslinks})
+                if (newslink.startup_id, newslink.slug)
+                in created_newslinks])
+            loaded.append(NewsLink)
+        return loaded
+
+    def send_loaded(self, model, instances):
+        post_bulk_load.send(
+            sender=model, instances=list(instances), using='default')
+
+    def upsert_startups(self, startups):
+        existing = Startup.objects.filter(slug__in=startups)
+        new_startups = dict(startups)
+        changed_slugs = set()
+        for startup in existing:
+            values = new_startups.pop(startup.slug)
+            changed = {
+                name: value for name, value in values.items()
+                if getattr(startup, name) != value}
+            if changed:
+                (Startup.objects
+                    .filter(pk=startup.pk)
+                    .update(**changed))
+                changed_slugs.add(startup.slug)
+                self.stats['startups_updated'] += 1
+        Startup.objects.bulk_create(
+            Startup(**values) for values in new_startups.values())
+        self.stats['startups_created'] += len(new_startups)
+        changed_slugs.update(new_startups)
+        return changed_slugs
+
+    def link_tags(self, startup_tags, startup_ids):
+        tag_slugs = set().union(*startup_tags.values())
+        tag_ids = dict(
+            Tag.objects
+            .filter(slug__in=tag_slugs)
+            .values_list('slug', 'pk'))
+        self.stats['unknown_tags'] += len(tag_slugs) - len(tag_ids)
+        Through = Startup.tags.through
+        existing = set(
+            Through.objects
+            .filter(startup_id__in=[
+                startup_ids[slug] for slug in startup_tags])
+            .values_list('startup_id', 'tag_id'))
+        new_links = {
+            (startup_ids[startup_slug], tag_ids[tag_slug])
+            for startup_slug, tags in startup_tags.items()
+            for tag_slug in tags if tag_slug in tag_ids}
+        new_links -= existing
+        Through.objects.bulk_create(
+            Through(startup_id=startup_id, tag_id=tag_id)
+            for startup_id, tag_id in new_links)
+        self.stats['tag_links_created'] += len(new_links)
+        return new_links
+
+    def create_newslinks(self, newslinks, startup_ids):
+        new_newslinks = {}
+        for (startup_slug, slug), values in newslinks.items():
+            if startup_slug not in startup_ids:
+                self.stats['invalid'] += 1
+                continue
+            startup_id = startup_ids[startup_slug]
+            new_newslinks[(startup_id, slug)] = values
+        existing = set(
+            NewsLink.objects
+            .filter(
+                startup_id__in={
+                    startup_id for startup_id, slug in new_newslinks},
+                slug__in={slug for startup_id, slug in new_newslinks})
+            .values_list('startup_id', 'slug'))
+        created = set(new_newslinks) - existing
+        NewsLink.objects.bulk_create(
+            NewsLink(startup_id=startup_id, **values)
+            for (startup_id, slug), values in new_newslinks.items()
+            if (startup_id, slug) in created)
+        self.stats['newslinks_created'] += len(created)
+        return created
@@ -1,20 +1,26 @@
 from datetime import date
 
 from django.db import models
-from django.core.urlresolvers import reverse
+from django.db.models import F
+
+from core.fields import CanonicalSlugField
+from core.utils import CachedUrlMixin
+
+from .linkcheck import DEAD_STATUSES
 
 
 
 class TagManager(models.Manager):
+    natural_key_fields = ('slug',)
 
     def get_by_natural_key(self,slug):
         return self.get(slug=slug)
 
 
-class Tag(models.Model):
+class Tag(CachedUrlMixin, models.Model):
     name = models.CharField(max_length=31, unique=True)
-    slug = models.SlugField(max_length=31, unique=True,
-                            help_text='A label for URL config.')
+    slug = CanonicalSlugField(max_length=31, unique=True,
+                              help_text='A label for URL config.')
 
     objects = TagManager()
 
@@ -25,34 +31,60 @@ class Tag(models.Model):
         return self.name
 
     def get_absolute_url(self):
-        return reverse('organizer_tag_detail',
-                       args=(self.slug,))
+        return self.cached_url('organizer_tag_detail',
+                               slug=self.slug)
+
+    def get_feed_url(self):
+        return self.cached_url('organizer_tag_rss_feed',
+                               slug=self.slug)
 
     def get_update_url(self):
-        return reverse('organizer_tag_update',
-                        kwargs={'slug':self.slug})
+        return self.cached_url('organizer_tag_update',
+                               slug=self.slug)
 
     def get_delete_url(self):
-        return reverse('organizer_tag_delete',
-                        kwargs={'slug':self.slug})
+        return self.cached_url('organizer_tag_delete',
+                               slug=self.slug)
+
+    def related_tags(self):
+        return [neighbour.related
+                for neighbour in self.neighbours.all()]
 
     def published_posts(self):
-        return self.blog_posts.filter(pub_date__lt=date.today())
+        if hasattr(self, 'post_list'):
+            today = date.today()
+            return [post for post in self.post_list
+                    if post.pub_date <= today]
+        return self.blog_posts.published()
 
     def natural_key(self):
         return (self.slug,)
 
 
+class RelatedTag(models.Model):
+    tag = models.ForeignKey(Tag, related_name='neighbours')
+    related = models.ForeignKey(Tag, related_name='+')
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['-weight']
+        unique_together = ('tag', 'related')
+
+    def __str__(self):
+        return "{}:{}".format(self.tag_id, self.related_id)
+
+
 class StartupManager(models.Manager):
+    natural_key_fields = ('slug',)
 
     def get_by_natural_key(self,slug):
         return self.get(slug=slug)
 
 
-class Startup(models.Model):
+class Startup(CachedUrlMixin, models.Model):
     name = models.CharField(max_length=31, db_index=True)
-    slug = models.SlugField(max_length=31, unique=True,
-                            help_text='A label for URL config.')
+    slug = CanonicalSlugField(max_length=31, unique=True,
+                              help_text='A label for URL config.')
     description = models.TextField()
     founded_date = models.DateField('date founded')
     contact = models.EmailField()
@@ -69,38 +101,76 @@ class Startup(models.Model):
         return self.name
 
     def get_absolute_url(self):
-        return reverse('organizer_startup_detail',
-                      kwargs={'slug':self.slug})
+        return self.cached_url('organizer_startup_detail',
+                               slug=self.slug)
+
+    def get_feed_url(self):
+        return self.cached_url('organizer_startup_rss_feed',
+                               slug=self.slug)
 
     def get_newslink_create_url(self):
-        return reverse(
+        return self.cached_url(
             'organizer_newslink_create',
-            kwargs={'startup_slug':self.slug})
+            startup_slug=self.slug)
 
     def get_update_url(self):
-        return reverse('organizer_startup_update',
-                        kwargs={'slug': self.slug})
+        return self.cached_url('organizer_startup_update',
+                               slug=self.slug)
 
     def get_delete_url(self):
-        return reverse('organizer_startup_delete',
-                        kwargs={'slug': self.slug})
+        return self.cached_url('organizer_startup_delete',
+                               slug=self.slug)
+
+    def related_tags(self, limit=10):
+        tags = getattr(self, 'tag_list', None)
+        if tags is None:
+            tags = self.tags.all()
+        own_tags = set()
+        weights = {}
+        related = {}
+        for tag in tags:
+            own_tags.add(tag.pk)
+            for neighbour in tag.neighbours.all():
+                weights[neighbour.related_id] = (
+                    weights.get(neighbour.related_id, 0)
+                    + neighbour.weight)
+                related[neighbour.related_id] = neighbour.related
+        ranked = sorted(
+            (tag_id for tag_id in weights if tag_id not in own_tags),
+            key=lambda tag_id: (-weights[tag_id],
+                                related[tag_id].name))
+        return [related[tag_id] for tag_id in ranked[:limit]]
 
     def natural_key(self):
         return (self.slug,)
 
 
-class NewsLinkManager(models.Manager):
+class NewsLinkQueryset(models.QuerySet):
+
+    def with_startup_slug(self):
+        return self.annotate(startup_slug=F('startup__slug'))
+
+
+class BaseNewsLinkManager(models.Manager):
+    natural_key_fields = ('startup__slug', 'slug')
 
     def get_by_natural_key(self, startup_slug, slug):
         return self.get(startup__slug=startup_slug, slug=slug)
 
+NewsLinkManager = BaseNewsLinkManager.from_queryset(NewsLinkQueryset)
+
 
-class NewsLink(models.Model):
+class NewsLink(CachedUrlMixin, models.Model):
     title = models.CharField(max_length=63)
     pub_date = models.DateField('date published')
     link = models.URLField(max_length=255)
     startup = models.ForeignKey(Startup)
-    slug = models.SlugField(max_length=63)
+    slug = CanonicalSlugField(max_length=63)
+    link_status = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False,
+        help_text='HTTP status of the last link check; 0 on failure.')
+    link_checked = models.DateTimeField(
+        null=True, blank=True, editable=False)
 
     objects = NewsLinkManager()
 
@@ -113,20 +183,31 @@ class NewsLink(models.Model):
     def __str__(self):
         return "{}:{}".format(self.startup, self.title)
 
+    def get_startup_slug(self):
+        startup_slug = self.__dict__.get('startup_slug')
+        if startup_slug is None:
+            startup_slug = self.startup.slug
+        return startup_slug
+
     def get_absolute_url(self):
-        return self.startup.get_absolute_url()
+        return self.cached_url('organizer_startup_detail',
+                               slug=self.get_startup_slug())
+
+    @property
+    def is_dead(self):
+        return self.link_status in DEAD_STATUSES
 
     def get_update_url(self):
-        return reverse('organizer_newslink_update',
-                       kwargs={
-                            'startup_slug':self.startup.slug,
-                            'newslink_slug':self.slug})
+        return self.cached_url(
+            'organizer_newslink_update',
+            startup_slug=self.get_startup_slug(),
+            newslink_slug=self.slug)
 
     def get_delete_url(self):
-        return reverse(
+        return self.cached_url(
             'organizer_newslink_delete',
-            kwargs={'startup_slug': self.startup.slug,
-                    'newslink_slug': self.slug})
+            startup_slug=self.get_startup_slug(),
+            newslink_slug=self.slug)
 
     def natural_key(self):
         return (self.startup.natural_key(),self.slug)
@@ -0,0 +1,108 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete)
+from django.dispatch import receiver
+
+from blog.models import Post
+from core.signals import post_bulk_load
+from core.utils import touch_model_stamp
+
+from .cooccurrence import (
+    affected_tag_ids, refresh_related_tags, tag_sources)
+from .facets import current_startup_facets, update_startup_facets
+from .models import NewsLink, Startup, Tag
+from .sitemaps import StartupSitemap, TagSitemap
+
+
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Startup)
+@receiver([post_save, post_delete], sender=NewsLink)
+def touch_organizer_stamp(sender, **kwargs):
+    touch_model_stamp(sender)
+
+
+@receiver(m2m_changed, sender=Startup.tags.through)
+def touch_startup_tags_stamp(sender, instance, action,
+                             reverse, pk_set, **kwargs):
+    if action.startswith('post_'):
+        facets = current_startup_facets()
+        touch_model_stamp(Startup)
+        update_startup_facets(
+            facets, action, instance, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=Startup.tags.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_related_tags(sender, instance, action,
+                        reverse, pk_set, **kwargs):
+    owner_field = dict(tag_sources())[sender]
+    if action == 'pre_clear':
+        if reverse:
+            owners = (
+                sender.objects
+                .filter(tag_id=instance.pk)
+                .values(owner_field))
+            tag_ids = affected_tag_ids(sender, owner_field, owners)
+            tag_ids.add(instance.pk)
+        else:
+            tag_ids = affected_tag_ids(
+                sender, owner_field, [instance.pk])
+        instance._cleared_tag_ids = tag_ids
+    elif action == 'post_clear':
+        refresh_related_tags(
+            getattr(instance, '_cleared_tag_ids', ()))
+    elif action in ('post_add', 'post_remove'):
+        if reverse:
+            tag_ids = affected_tag_ids(sender, owner_field, pk_set)
+            tag_ids.add(instance.pk)
+        else:
+            tag_ids = affected_tag_ids(
+                sender, owner_field, [instance.pk])
+            tag_ids.update(pk_set)
+        refresh_related_tags(tag_ids)
+
+
+@receiver(pre_delete, sender=Startup)
+@receiver(pre_delete, sender=Post)
+def capture_deleted_related_tags(sender, instance, **kwargs):
+    through = sender.tags.through
+    owner_field = dict(tag_sources())[through]
+    instance._deleted_tag_ids = affected_tag_ids(
+        through, owner_field, [instance.pk])
+
+
+@receiver(post_delete, sender=Startup)
+@receiver(post_delete, sender=Post)
+def refresh_deleted_related_tags(sender, instance, **kwargs):
+    refresh_related_tags(getattr(instance, '_deleted_tag_ids', ()))
+
+
+@receiver(post_bulk_load, sender=Startup)
+@receiver(post_bulk_load, sender=Post)
+def refresh_loaded_related_tags(sender, instances, **kwargs):
+    through = sender.tags.through
+    owner_field = dict(tag_sources())[through]
+    refresh_related_tags(affected_tag_ids(
+        through, owner_field, [obj.pk for obj in instances]))
+
+
+@receiver([post_save, post_delete], sender=Startup)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_sitemap(sender, instance, **kwargs):
+    sitemap_class = {
+        Startup: StartupSitemap, Tag: TagSitemap}[sender]
+    sitemap_class.invalidate([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=NewsLink)
+def invalidate_newslink_sitemap(sender, instance, **kwargs):
+    StartupSitemap.invalidate([instance.startup_id])
+
+
+@receiver(post_bulk_load, sender=Tag)
+@receiver(post_bulk_load, sender=Startup)
+@receiver(post_bulk_load, sender=NewsLink)
+def invalidate_loaded_sitemap(sender, **kwargs):
+    if sender is Tag:
+        TagSitemap.invalidate()
+    else:
+        StartupSitemap.invalidate()
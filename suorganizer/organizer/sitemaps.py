@@ -0,0 +1,68 @@
+from datetime import date
+
+from django.db.models import Case, DateField, F, Max, When
+
+from core.sitemaps import ShardedSitemap
+from core.utils import fast_reverse
+
+from .models import Startup, Tag
+
+
+class StartupSitemap(ShardedSitemap):
+    section = 'startups'
+    model = Startup
+    row_fields = ('slug', 'founded_date', 'latest_news')
+    changefreq = 'weekly'
+    priority = 0.6
+
+    def get_row_queryset(self):
+        return Startup.objects.annotate(
+            latest_news=Max('newslink__pub_date'))
+
+    def shard_aggregates(self):
+        return {
+            'founded_date': Max('founded_date'),
+            'latest_news': Max('newslink__pub_date'),
+        }
+
+    def location(self, row):
+        return fast_reverse(
+            'organizer_startup_detail', {'slug': row[1]})
+
+    def lastmod(self, row):
+        pk, slug, founded_date, latest_news = row
+        if latest_news is None:
+            return founded_date
+        return max(founded_date, latest_news)
+
+    def shard_lastmod(self, values):
+        if values['latest_news'] is None:
+            return values['founded_date']
+        return max(values['founded_date'], values['latest_news'])
+
+
+class TagSitemap(ShardedSitemap):
+    section = 'tags'
+    model = Tag
+    row_fields = ('slug', 'latest_post')
+    changefreq = 'weekly'
+    priority = 0.5
+
+    def latest_post(self):
+        return Max(Case(
+            When(blog_posts__pub_date__lte=date.today(),
+                 then=F('blog_posts__pub_date')),
+            output_field=DateField()))
+
+    def get_row_queryset(self):
+        return Tag.objects.annotate(latest_post=self.latest_post())
+
+    def shard_aggregates(self):
+        return {'lastmod': self.latest_post()}
+
+    def location(self, row):
+        return fast_reverse(
+            'organizer_tag_detail', {'slug': row[1]})
+
+    def lastmod(self, row):
+        return row[2]
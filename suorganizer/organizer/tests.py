@@ -1,3 +1,190 @@
-from django.test import TestCase
+import socket
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import StringIO
+from socketserver import ThreadingMixIn
+from types import SimpleNamespace
+from unittest import skipIf
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core.pagecache import get_tag_versions, instance_tag
+from core.utils import get_model_stamp
+
+from .facets import StartupFacets
+from .linkcheck import FAILED, aiohttp
+from .models import NewsLink, Startup
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    head_statuses = {
+        '/ok': 200,
+        '/gone': 404,
+        '/broken': 500,
+        '/expired': 410,
+        '/forbidden': 403,
+        '/no-head': 405,
+    }
+    get_statuses = {
+        '/no-head': 200,
+    }
+
+    def respond(self, statuses):
+        self.server.hits.append((self.command, self.path))
+        self.send_response(statuses.get(self.path, 404))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.respond(self.head_statuses)
+
+    def do_GET(self):
+        self.respond(self.get_statuses)
+
+    def log_message(self, *args):
+        pass
+
+
+@skipIf(aiohttp is None, 'checknewslinks needs aiohttp installed.')
+class CheckNewsLinksTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.server = StandInServer(('127.0.0.1', 0), StandInHandler)
+        self.server.hits = []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.startup = Startup.objects.create(
+            name='Stand In', slug='stand-in',
+            description='Local link checker target.',
+            founded_date=date(2015, 1, 1),
+            contact='stand-in@example.com',
+            website='http://example.com/')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def url(self, path):
+        return 'http://127.0.0.1:{}{}'.format(
+            self.server.server_address[1], path)
+
+    def create_link(self, slug, url):
+        return NewsLink.objects.create(
+            title=slug, slug=slug, pub_date=date(2015, 1, 1),
+            link=url, startup=self.startup)
+
+    def check_links(self, **options):
+        options.setdefault('retries', 1)
+        options.setdefault('timeout', 5.0)
+        call_command('checknewslinks', stdout=StringIO(), **options)
+
+    def test_statuses_are_saved(self):
+        paths = ('/ok', '/gone', '/broken', '/no-head')
+        for path in paths:
+            self.create_link(path.strip('/'), self.url(path))
+        self.check_links()
+        statuses = dict(
+            NewsLink.objects.values_list('slug', 'link_status'))
+        self.assertEqual(statuses, {
+            'ok': 200, 'gone': 404, 'broken': 500, 'no-head': 200})
+        self.assertFalse(
+            NewsLink.objects.filter(link_checked__isnull=True).exists())
+        self.assertEqual(
+            self.server.hits.count(('HEAD', '/broken')), 2)
+        self.assertIn(('GET', '/no-head'), self.server.hits)
+        self.assertNotIn(('GET', '/ok'), self.server.hits)
+
+    def test_unreachable_link_fails(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        self.create_link(
+            'closed', 'http://127.0.0.1:{}/ok'.format(port))
+        self.check_links(retries=0)
+        newslink = NewsLink.objects.get(slug='closed')
+        self.assertEqual(newslink.link_status, FAILED)
+        self.assertTrue(newslink.is_dead)
+
+    def test_only_missing_links_are_dead(self):
+        paths = ('/ok', '/gone', '/expired', '/forbidden', '/broken')
+        for path in paths:
+            self.create_link(path.strip('/'), self.url(path))
+        self.check_links(retries=0)
+        dead = {
+            newslink.slug: newslink.is_dead
+            for newslink in NewsLink.objects.all()}
+        self.assertEqual(dead, {
+            'ok': False, 'gone': True, 'expired': True,
+            'forbidden': False, 'broken': False})
+
+    def test_status_changes_invalidate_caches(self):
+        newslink = self.create_link('gone', self.url('/gone'))
+        startup_tag = instance_tag(Startup, self.startup.pk)
+        stamp = get_model_stamp(NewsLink)
+        version = get_tag_versions([startup_tag], 0)[startup_tag]
+        self.check_links()
+        self.assertNotEqual(get_model_stamp(NewsLink), stamp)
+        self.assertNotEqual(
+            get_tag_versions([startup_tag], 0)[startup_tag], version)
+        stamp = get_model_stamp(NewsLink)
+        version = get_tag_versions([startup_tag], 0)[startup_tag]
+        self.check_links()
+        self.assertEqual(get_model_stamp(NewsLink), stamp)
+        self.assertEqual(
+            get_tag_versions([startup_tag], 0)[startup_tag], version)
+        newslink.refresh_from_db()
+        self.assertEqual(newslink.link_status, 404)
+
+
+class StartupFacetsTests(SimpleTestCase):
+    tags = [(1, 'Common', 'common'), (2, 'Rare', 'rare'),
+            (3, 'Unused', 'unused')]
+
+    def build(self, pairs):
+        return StartupFacets(
+            range(100, 200), self.tags, sorted(pairs))
+
+    def state(self, facets):
+        return ({tag_id: facets.matching_ids(facets.as_bits(members))
+                 for tag_id, members in facets.members.items()
+                 if facets.member_count(members)},
+                facets.counts(facets.match([1])))
+
+    def test_sparse_and_dense_tags(self):
+        pairs = [(1, pk) for pk in range(100, 200, 2)]
+        pairs += [(2, 100), (2, 102), (2, 150)]
+        facets = self.build(pairs)
+        self.assertIsInstance(facets.members[1], int)
+        self.assertNotIsInstance(facets.members[2], int)
+        self.assertEqual(facets.counts(), {1: 50, 2: 3})
+        self.assertEqual(
+            facets.matching_ids(facets.match([1, 2])), [100, 102, 150])
+        self.assertEqual(
+            facets.counts(facets.match([2])), {1: 3, 2: 3})
+
+    def test_updates_match_rebuild(self):
+        pairs = {(1, pk) for pk in range(100, 200, 2)}
+        pairs |= {(2, 100), (2, 102), (2, 150)}
+        facets = self.build(pairs)
+        startup = SimpleNamespace(pk=102)
+        facets.apply('post_add', startup, False, {3})
+        facets.apply('post_clear', startup, False, None)
+        facets.apply(
+            'post_add', SimpleNamespace(pk=2), True, set(range(160, 200)))
+        facets.apply('post_remove', SimpleNamespace(pk=150), False, {2})
+        pairs.discard((1, 102))
+        pairs.discard((2, 102))
+        pairs.discard((2, 150))
+        pairs |= {(2, pk) for pk in range(160, 200)}
+        self.assertIsInstance(facets.members[2], int)
+        self.assertEqual(self.state(facets), self.state(self.build(pairs)))
@@ -1,5 +1,6 @@
 from django.conf.urls import url
 
+from organizer.feeds import AtomStartupFeed, Rss2StartupFeed
 from organizer.views import (
     StartupCreate, StartupList,StartupDetail, 
     StartupUpdate, StartupDelete, NewsLinkCreate,
@@ -15,6 +16,12 @@ urlpatterns = [
     url(r'^(?P<slug>[\w\-]+)/$',
         StartupDetail.as_view(),
         name='organizer_startup_detail'),
+    url(r'^(?P<slug>[\w\-]+)/feed/atom/$',
+        AtomStartupFeed(),
+        name='organizer_startup_atom_feed'),
+    url(r'^(?P<slug>[\w\-]+)/feed/rss/$',
+        Rss2StartupFeed(),
+        name='organizer_startup_rss_feed'),
     url(r'^(?P<slug>[\w\-]+)/update/$',
         StartupUpdate.as_view(),
         name='organizer_startup_update'),
@@ -1,20 +1,30 @@
 from django.conf.urls import url
 from django.contrib.auth.decorators import login_required
 
+from organizer.feeds import AtomTagFeed, Rss2TagFeed
 from organizer.views import (
-    TagCreate, TagList, TagPageList,
+    TagAutocomplete, TagCreate, TagList, TagPageList,
     TagDetail, TagDelete, TagUpdate)
 
 urlpatterns = [
     url(r'^$', 
         TagList.as_view(),
         name='organizer_tag_list'),
+    url(r'^autocomplete/$',
+        TagAutocomplete.as_view(),
+        name='organizer_tag_autocomplete'),
     # url(r'^create/$',
     #     TagCreate.as_view(),
     #     name='organizer_tag_create'),
     url(r'^(?P<slug>[\w\-]+)/$', 
         TagDetail.as_view(),
         name='organizer_tag_detail'),
+    url(r'^(?P<slug>[\w\-]+)/feed/atom/$',
+        AtomTagFeed(),
+        name='organizer_tag_atom_feed'),
+    url(r'^(?P<slug>[\w\-]+)/feed/rss/$',
+        Rss2TagFeed(),
+        name='organizer_tag_rss_feed'),
     url(r'^(?P<slug>[\w\-]+)/update/$',
         TagUpdate.as_view(),
         name='organizer_tag_update'),
@@ -1,26 +1,206 @@
+import json
+
 from django.shortcuts import redirect, render, get_object_or_404
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import (
+    ImproperlyConfigured, ValidationError)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q
+from django.http import HttpResponseRedirect
+from django.utils.encoding import force_bytes, force_text
+from django.utils.http import (
+    urlsafe_base64_decode, urlsafe_base64_encode)
 from django.views.generic import View
 from .models import Startup, NewsLink
 
 
 
 
+class KeysetPage:
+
+    def __init__(self, object_list, paginator,
+                 has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def number(self):
+        return None
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def previous_cursor(self):
+        if not self.object_list:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[0])
+
+    def next_cursor(self):
+        if not self.object_list:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[-1])
+
+    def last_cursor(self):
+        return self.paginator.encode_values([])
+
+
+class KeysetPaginator:
+
+    def __init__(self, queryset, per_page,
+                 ordering=('name', 'pk')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    def encode_values(self, values):
+        data = json.dumps(values, cls=DjangoJSONEncoder)
+        return force_text(
+            urlsafe_base64_encode(force_bytes(data)))
+
+    def encode_cursor(self, obj):
+        return self.encode_values(
+            [getattr(obj, field.lstrip('-'))
+             for field in self.ordering])
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(
+                force_text(urlsafe_base64_decode(cursor)))
+        except ValueError:
+            return None
+        if (not isinstance(values, list)
+                or len(values) not in (0, len(self.ordering))):
+            return None
+        opts = self.queryset.model._meta
+        try:
+            return [
+                self.to_python(opts, field.lstrip('-'), value)
+                for field, value in zip(self.ordering, values)]
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def to_python(self, opts, name, value):
+        if value is None:
+            raise ValueError('Cursor values cannot be null.')
+        field = opts.pk if name == 'pk' else opts.get_field(name)
+        return field.to_python(value)
+
+    def _seek(self, values, lookup):
+        flipped = {'gt': 'lt', 'lt': 'gt'}[lookup]
+        names = [field.lstrip('-') for field in self.ordering]
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            field_lookup = (
+                flipped if field.startswith('-') else lookup)
+            filter_dict = dict(zip(names[:i], values[:i]))
+            filter_dict[
+                '{}__{}'.format(names[i], field_lookup)] = values[i]
+            condition |= Q(**filter_dict)
+        return condition
+
+    def page(self, after=None, before=None):
+        if after is not None:
+            after = self.decode_cursor(after)
+        if before is not None:
+            before = self.decode_cursor(before)
+        size = self.per_page
+        if before is not None:
+            reverse_ordering = [
+                field[1:] if field.startswith('-') else '-' + field
+                for field in self.ordering]
+            queryset = self.queryset.order_by(*reverse_ordering)
+            if before:
+                queryset = queryset.filter(
+                    self._seek(before, 'lt'))
+            object_list = list(queryset[:size + 1])
+            has_previous = len(object_list) > size
+            object_list = object_list[:size]
+            object_list.reverse()
+            return KeysetPage(
+                object_list, self,
+                has_previous=has_previous,
+                has_next=bool(before))
+        queryset = self.queryset.order_by(*self.ordering)
+        if after:
+            queryset = queryset.filter(self._seek(after, 'gt'))
+        object_list = list(queryset[:size + 1])
+        return KeysetPage(
+            object_list[:size], self,
+            has_previous=bool(after),
+            has_next=len(object_list) > size)
+
+
 class PageLinksMixin:
+    after_kwarg = 'after'
+    before_kwarg = 'before'
+    keyset_ordering = ('name', 'pk')
     page_kwarg = 'page'
+    paginate_keyset = False
+
+    def get_paginate_keyset(self):
+        return self.paginate_keyset
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.get_paginate_keyset():
+            return super().paginate_queryset(
+                queryset, page_size)
+        paginator = KeysetPaginator(
+            queryset, page_size, self.keyset_ordering)
+        page = paginator.page(
+            after=self.request.GET.get(self.after_kwarg),
+            before=self.request.GET.get(self.before_kwarg))
+        return (paginator, page, page.object_list,
+                page.has_other_pages())
+
+    def _query_urls(self, **params):
+        query = self.request.GET.copy()
+        for kwarg in (self.page_kwarg, self.after_kwarg,
+                      self.before_kwarg):
+            query.pop(kwarg, None)
+        for key, value in params.items():
+            query[key] = value
+        return "?{}".format(query.urlencode())
+
+    def _cursor_urls(self, cursor_kwarg, cursor):
+        return self._query_urls(**{cursor_kwarg: cursor})
 
     def _page_urls(self, page_number):
-        return "?{pkw}={n}".format(
-            pkw=self.page_kwarg,
-            n=page_number)
+        return self._query_urls(**{self.page_kwarg: page_number})
 
     def previous_page(self, page):
+        if isinstance(page, KeysetPage):
+            if page.has_previous():
+                return self._cursor_urls(
+                    self.before_kwarg,
+                    page.previous_cursor())
+            return None
         if (page.has_previous() and page.number > 2):
             return self._page_urls(
                 page.previous_page_number())
         return None
 
     def next_page(self, page):
+        if isinstance(page, KeysetPage):
+            if page.has_next():
+                return self._cursor_urls(
+                    self.after_kwarg,
+                    page.next_cursor())
+            return None
         last_page = page.paginator.num_pages
         if (page.has_next() and page.number < last_page -1):
             return self._page_urls(
@@ -44,11 +224,21 @@ class PageLinksMixin:
         return context
 
     def first_page(self, page):
+        if isinstance(page, KeysetPage):
+            if page.has_previous():
+                return self._query_urls()
+            return None
         if page.number > 1:
             return self._page_urls(1)
         return None
 
     def last_page(self, page):
+        if isinstance(page, KeysetPage):
+            if page.has_next():
+                return self._cursor_urls(
+                    self.before_kwarg,
+                    page.last_cursor())
+            return None
         last_page = page.paginator.num_pages
         if page.number < last_page:
             return self._page_urls(last_page)
@@ -83,7 +273,7 @@ class ObjectUpdateMixin:
     template_name = ''
 
     def get(self, request, slug):
-        obj = get_object_or_404(self.model, slug__iexact=slug)
+        obj = get_object_or_404(self.model, slug=slug)
         context = {
             'form': self.form_class(instance=obj),
             self.model.__name__.lower(): obj,
@@ -92,7 +282,7 @@ class ObjectUpdateMixin:
         return render(request, self.template_name, context)
 
     def post(self, request, slug):
-        obj = get_object_or_404(self.model, slug__iexact=slug)
+        obj = get_object_or_404(self.model, slug=slug)
         bound_form = self.form_class(request.POST, instance=obj)
         if bound_form.is_valid():
             new_object = bound_form.save()
@@ -112,7 +302,7 @@ class ObjectDeleteMixin:
 
     def get(self, request, slug):
         obj = get_object_or_404(
-            self.model, slug__iexact=slug)
+            self.model, slug=slug)
         context = {
             self.model.__name__.lower(): obj,
         }
@@ -121,7 +311,7 @@ class ObjectDeleteMixin:
 
     def post(self, request, slug):
         obj = get_object_or_404(
-            self.model, slug__iexact=slug)
+            self.model, slug=slug)
         obj.delete()
         return HttpResponseRedirect(self.success_url)
             
@@ -129,6 +319,7 @@ class ObjectDeleteMixin:
 class DetailView(View):
     context_object_name = ''
     model = None
+    prefetch_related = ()
     template_name = ''
     template_name_suffix = '_detail'
 
@@ -174,15 +365,25 @@ class DetailView(View):
                 " from URL pattern.".format(
                     c=self.__class__.__name__,
                     p='slug'))
+        return get_object_or_404(
+            self.get_queryset(), slug=slug)
 
-        if self.model:
-            return get_object_or_404(self.model, slug__iexact=slug)
-        else:
+    def get_prefetch_related(self):
+        return self.prefetch_related
+
+    def get_queryset(self):
+        if self.model is None:
             raise ImproperlyConfigured(
                 "{c} needs {a} attribute "
                 " specified to work.".format(
                     c=self.__class__.__name__,
-                    p='model'))
+                    a='model'))
+        queryset = self.model._default_manager.all()
+        prefetch_related = self.get_prefetch_related()
+        if prefetch_related:
+            queryset = queryset.prefetch_related(
+                *prefetch_related)
+        return queryset
 
 
 class NewsLinkGetObjectMixin():
@@ -193,9 +394,9 @@ class NewsLinkGetObjectMixin():
         newslink_slug = self.kwargs.get(
             self.slug_url_kwarg)
         return get_object_or_404(
-            NewsLink,
-            slug__iexact=newslink_slug,
-            startup__slug__iexact=startup_slug)
+            NewsLink.objects.with_startup_slug(),
+            slug=newslink_slug,
+            startup__slug=startup_slug)
 
 
 class StartupContextMixin():
@@ -211,8 +412,8 @@ class StartupContextMixin():
         else:
 
             startup_slug = self.kwargs.get(self.startup_slug_url_kwarg)
-            starup = get_object_or_404(
-                Startup, slug__iexact=startup_slug)
+            startup = get_object_or_404(
+                Startup, slug=startup_slug)
             context = {
                 self.startup_context_object_name:startup,
             }
@@ -1,38 +1,129 @@
 from django.shortcuts import get_object_or_404, render, redirect
 from django.views.generic import (
-    View, DetailView, CreateView, 
+    View, CreateView, 
     DeleteView, ListView, DateDetailView)
 from django.core.paginator import (
     EmptyPage, PageNotAnInteger, Paginator)
-from django.core.urlresolvers import reverse_lazy
+from django.core.urlresolvers import reverse, reverse_lazy
 from django.contrib.auth.decorators import (
     login_required, 
     user_passes_test,
     permission_required)
 from django.utils.decorators import method_decorator
 from django.contrib.auth import PermissionDenied
+from django.db.models import Prefetch
+from django.http import JsonResponse
 
 
 
-from .models import Tag, Startup, NewsLink
+from blog.models import Post
+from blog.utils import AllowFuturePermissionMixin
+
+from .autocomplete import get_tag_index
+from .facets import FacetResults, get_startup_facets
+from .models import Tag, Startup, NewsLink, RelatedTag
 from .forms import (
     TagForm, StartupForm, NewsLinkForm)
 from .utils import (
-    CreateView, ObjectUpdateMixin, ObjectDeleteMixin,
+    CreateView, DetailView, ObjectUpdateMixin, ObjectDeleteMixin,
     PageLinksMixin,NewsLinkGetObjectMixin, StartupContextMixin)
 from user.decorators import require_authenticated_permission, class_login_required
 
-from core.utils import UpdateView
+from core.pagecache import PageCacheListMixin, collection_tag, tag_page
+from core.utils import CachedCountPaginator, UpdateView, fast_reverse
 
 
-class TagList(PageLinksMixin, ListView):
+class TagList(PageCacheListMixin, PageLinksMixin, ListView):
     paginate_by = 5
+    paginate_keyset = True
     model = Tag
 
 
-class StartupList(PageLinksMixin, ListView):
+class StartupList(PageCacheListMixin, PageLinksMixin, ListView):
+    facet_limit = 20
+    mode_kwarg = 'mode'
     model = Startup
+    page_cache_models = (Tag, Startup.tags.through)
     paginate_by = 5
+    paginate_keyset = True
+    tags_kwarg = 'tags'
+
+    def get(self, request, *args, **kwargs):
+        self.facets = get_startup_facets()
+        self.tag_slugs = [
+            slug for slug in request.GET.get(
+                self.tags_kwarg, '').lower().split(',')
+            if slug]
+        self.mode = request.GET.get(self.mode_kwarg)
+        if self.mode != 'any':
+            self.mode = 'all'
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.tag_slugs:
+            return queryset
+        self.facet_bits = self.facets.match(
+            [self.facets.tag_ids.get(slug)
+             for slug in self.tag_slugs],
+            self.mode)
+        return FacetResults(self.facets, self.facet_bits, queryset)
+
+    def get_paginate_keyset(self):
+        return self.paginate_keyset and not self.tag_slugs
+
+    def get_paginator(self, queryset, *args, **kwargs):
+        if isinstance(queryset, FacetResults):
+            return Paginator(queryset, *args, **kwargs)
+        return super().get_paginator(queryset, *args, **kwargs)
+
+    def _facet_url(self, slugs):
+        query = self.request.GET.copy()
+        for kwarg in (self.page_kwarg, self.after_kwarg,
+                      self.before_kwarg, self.tags_kwarg):
+            query.pop(kwarg, None)
+        if slugs:
+            query[self.tags_kwarg] = ','.join(slugs)
+        return "?{}".format(query.urlencode())
+
+    def get_facet_list(self):
+        counts = self.facets.counts(
+            self.facet_bits if self.tag_slugs else None)
+        selected_ids = [
+            self.facets.tag_ids[slug] for slug in self.tag_slugs
+            if slug in self.facets.tag_ids]
+        ranked = sorted(
+            (tag_id for tag_id in counts
+             if tag_id not in selected_ids),
+            key=lambda tag_id: (
+                -counts[tag_id], self.facets.tags[tag_id]))
+        facet_list = []
+        for tag_id in selected_ids + ranked[:self.facet_limit]:
+            name, slug = self.facets.tags[tag_id]
+            selected = tag_id in selected_ids
+            if selected:
+                slugs = [s for s in self.tag_slugs if s != slug]
+            else:
+                slugs = self.tag_slugs + [slug]
+            facet_list.append({
+                'count': counts.get(tag_id, 0),
+                'name': name,
+                'selected': selected,
+                'url': self._facet_url(slugs),
+            })
+        return facet_list
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        other_mode = 'any' if self.mode == 'all' else 'all'
+        context.update({
+            'facet_list': self.get_facet_list(),
+            'facet_mode': self.mode,
+            'facet_other_mode': other_mode,
+            'facet_other_mode_url': self._query_urls(
+                **{self.mode_kwarg: other_mode}),
+        })
+        return context
 
 
 class NewsLinkCreate(
@@ -46,7 +137,7 @@ class NewsLinkCreate(
         startup_slug = self.kwargs.get(
             self.startup_slug_url_kwarg)
         self.startup = get_object_or_404(
-            Startup, slug__iexact=startup_slug)
+            Startup, slug=startup_slug)
         initial = {
             self.startup_context_object_name:
                 self.startup,
@@ -120,7 +211,8 @@ class TagPageList(View):
 
     def get(self, request, page_number):
         tags = Tag.objects.all()
-        paginator = Paginator(
+        tag_page(collection_tag(Tag))
+        paginator = CachedCountPaginator(
             tags, self.paginate_by)
         try:
             page = paginator.page(page_number)
@@ -159,16 +251,69 @@ class TagPageList(View):
             request, self.template_name, context)
 
 
-class TagDetail(DetailView):
+class TagAutocomplete(View):
+    limit = 10
+    max_limit = 50
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.limit))
+        except ValueError:
+            return self.limit
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        tags = get_tag_index().search(
+            request.GET.get('q', ''), self.get_limit())
+        return JsonResponse({
+            'results': [
+                {'name': name,
+                 'slug': slug,
+                 'url': fast_reverse(
+                     'organizer_tag_detail', {'slug': slug})}
+                for name, slug in tags],
+        })
+
+
+class TagDetail(AllowFuturePermissionMixin, DetailView):
 
     context_object_name = 'tag'
     model = Tag
     template_name = 'organizer/tag_detail.html'
 
+    def get_prefetch_related(self):
+        if self.get_allow_future():
+            post_queryset = Post.objects.all()
+        else:
+            post_queryset = Post.objects.published()
+        return (
+            Prefetch('startup_set', to_attr='startup_list'),
+            Prefetch('blog_posts',
+                     queryset=post_queryset,
+                     to_attr='post_list'),
+            Prefetch('neighbours',
+                     queryset=RelatedTag.objects.select_related(
+                         'related')),
+        )
+
+    def get_context_data(self):
+        context = super().get_context_data()
+        context['post_list'] = self.object.post_list
+        return context
+
+
 class StartupDetail(DetailView):
 
     context_object_name = 'startup'
     model = Startup
+    prefetch_related = (
+        Prefetch('tags', to_attr='tag_list'),
+        Prefetch('tag_list__neighbours',
+                 queryset=RelatedTag.objects.select_related(
+                     'related')),
+        Prefetch('newslink_set', to_attr='newslink_list'),
+        Prefetch('blog_posts', to_attr='post_list'),
+    )
     template_name = 'organizer/startup_detail.html'
 
 
@@ -0,0 +1 @@
+default_app_config = 'search.apps.SearchConfig'
\ No newline at end of file
@@ -0,0 +1,251 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .documents import documents, get_document, get_document_by_code
+
+
+def split_terms(query):
+    return re.findall(r'\w+', query or '', re.UNICODE)
+
+
+def has_fts5(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE temp.search_fts5_probe '
+                'USING fts5(body)')
+            cursor.execute('DROP TABLE temp.search_fts5_probe')
+    except OperationalError:
+        return False
+    return True
+
+
+class BaseSearchBackend:
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    def setup(self):
+        pass
+
+    def index(self, obj):
+        pass
+
+    def index_many(self, objects):
+        for obj in objects:
+            self.index(obj)
+
+    def remove(self, obj):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, query, models=None, until=None,
+               offset=0, limit=None):
+        raise NotImplementedError
+
+    def count(self, query, models=None, until=None):
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset, query):
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+
+    def _model_hits(self, document, terms, until):
+        fields = (document.title_field,) + tuple(document.body_fields)
+        queryset = document.model._default_manager.using(self.using)
+        queryset = queryset.filter(reduce(and_, [
+            reduce(or_, [
+                Q(**{'{}__icontains'.format(field): term})
+                for field in fields])
+            for term in terms]))
+        if until is not None and document.date_field:
+            queryset = queryset.filter(
+                **{'{}__lte'.format(document.date_field): until})
+        return [(document.model, pk)
+                for pk in queryset.values_list('pk', flat=True)]
+
+    def _hits(self, query, models, until):
+        terms = split_terms(query)
+        if not terms:
+            return []
+        hits = []
+        for document in documents:
+            if models is None or document.model in models:
+                hits.extend(
+                    self._model_hits(document, terms, until))
+        return hits
+
+    def search(self, query, models=None, until=None,
+               offset=0, limit=None):
+        hits = self._hits(query, models, until)
+        if limit is None:
+            return hits[offset:]
+        return hits[offset:offset + limit]
+
+    def count(self, query, models=None, until=None):
+        return len(self._hits(query, models, until))
+
+    def filter_queryset(self, queryset, query):
+        hits = self._hits(query, [queryset.model], None)
+        return queryset.filter(pk__in=[pk for model, pk in hits])
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    code_base = 16
+    table = 'search_index'
+    title_weight = 10.0
+
+    def __init__(self, using='default'):
+        super().__init__(using)
+        self.table_ready = False
+
+    def setup(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS {} '
+                'USING fts5(pub_date UNINDEXED, title, body, '
+                "tokenize = 'porter unicode61')"
+                .format(self.table))
+        self.table_ready = True
+
+    def ensure_table(self):
+        if not self.table_ready:
+            self.setup()
+
+    def cursor(self):
+        self.ensure_table()
+        return connections[self.using].cursor()
+
+    def rowid(self, document, pk):
+        return pk * self.code_base + document.code
+
+    def match_expression(self, query):
+        return ' '.join(
+            '"{}"*'.format(term) for term in split_terms(query))
+
+    def where(self, query, models, until):
+        where = ['{} MATCH %s'.format(self.table)]
+        params = [self.match_expression(query)]
+        if models is not None:
+            codes = [get_document(model).code for model in models]
+            where.append(
+                'rowid - (rowid / {base}) * {base} IN ({codes})'
+                .format(
+                    base=self.code_base,
+                    codes=', '.join('%s' for code in codes)))
+            params.extend(codes)
+        if until is not None:
+            where.append('(pub_date IS NULL OR pub_date <= %s)')
+            params.append(until.isoformat())
+        return ' AND '.join(where), params
+
+    def index(self, obj):
+        self.index_many([obj])
+
+    def index_many(self, objects):
+        rows = []
+        for obj in objects:
+            document = get_document(type(obj))
+            date = document.date(obj)
+            rows.append((
+                self.rowid(document, obj.pk),
+                date.isoformat() if date else None,
+                document.title(obj),
+                document.body(obj)))
+        with self.cursor() as cursor:
+            cursor.executemany(
+                'DELETE FROM {} WHERE rowid = %s'.format(self.table),
+                [row[:1] for row in rows])
+            cursor.executemany(
+                'INSERT INTO {} (rowid, pub_date, title, body) '
+                'VALUES (%s, %s, %s, %s)'.format(self.table),
+                rows)
+
+    def remove(self, obj):
+        document = get_document(type(obj))
+        with self.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM {} WHERE rowid = %s'.format(self.table),
+                [self.rowid(document, obj.pk)])
+
+    def clear(self):
+        with self.cursor() as cursor:
+            cursor.execute('DELETE FROM {}'.format(self.table))
+
+    def search(self, query, models=None, until=None,
+               offset=0, limit=None):
+        if not split_terms(query):
+            return []
+        where, params = self.where(query, models, until)
+        sql = (
+            'SELECT rowid FROM {table} WHERE {where} '
+            'ORDER BY bm25({table}, 0.0, {weight}, 1.0) '
+            'LIMIT %s OFFSET %s'.format(
+                table=self.table, where=where,
+                weight=self.title_weight))
+        params.extend([-1 if limit is None else limit, offset])
+        with self.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        hits = []
+        for (rowid,) in rows:
+            pk, code = divmod(rowid, self.code_base)
+            hits.append((get_document_by_code(code).model, pk))
+        return hits
+
+    def count(self, query, models=None, until=None):
+        if not split_terms(query):
+            return 0
+        where, params = self.where(query, models, until)
+        with self.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM {} WHERE {}'.format(
+                    self.table, where),
+                params)
+            return cursor.fetchone()[0]
+
+    def filter_queryset(self, queryset, query):
+        if not split_terms(query):
+            return queryset.none()
+        self.ensure_table()
+        quote_name = connections[self.using].ops.quote_name
+        opts = queryset.model._meta
+        where, params = self.where(query, [queryset.model], None)
+        return queryset.extra(
+            where=['{pk} IN (SELECT rowid / {base} FROM {table} '
+                   'WHERE {where})'.format(
+                       pk='{}.{}'.format(
+                           quote_name(opts.db_table),
+                           quote_name(opts.pk.column)),
+                       base=self.code_base,
+                       table=self.table,
+                       where=where)],
+            params=params)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'SEARCH_BACKEND', None)
+        if path is None:
+            connection = connections['default']
+            if (connection.vendor == 'sqlite'
+                    and has_fts5(connection)):
+                path = 'search.backends.SQLiteFTSBackend'
+            else:
+                path = 'search.backends.DatabaseSearchBackend'
+        _backend = import_string(path)()
+    return _backend
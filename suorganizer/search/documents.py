@@ -0,0 +1,51 @@
+from blog.models import Post
+from core.utils import model_label
+from organizer.models import Startup, Tag
+
+
+class SearchDocument:
+
+    def __init__(self, model, code, title_field,
+                 body_fields=(), date_field=None):
+        self.model = model
+        self.code = code
+        self.title_field = title_field
+        self.body_fields = body_fields
+        self.date_field = date_field
+
+    @property
+    def label(self):
+        return model_label(self.model)
+
+    def title(self, obj):
+        return getattr(obj, self.title_field)
+
+    def body(self, obj):
+        return '\n'.join(
+            getattr(obj, field) for field in self.body_fields)
+
+    def date(self, obj):
+        if self.date_field is None:
+            return None
+        return getattr(obj, self.date_field)
+
+
+documents = (
+    SearchDocument(Tag, 1, 'name'),
+    SearchDocument(Startup, 2, 'name', ('description',)),
+    SearchDocument(Post, 3, 'title', ('text',), 'pub_date'),
+)
+
+
+def get_document(model):
+    for document in documents:
+        if document.model is model:
+            return document
+    return None
+
+
+def get_document_by_code(code):
+    for document in documents:
+        if document.code == code:
+            return document
+    return None
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.utils import chunked
+
+from ...backends import get_backend
+from ...documents import documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Objects indexed per transaction.')
+
+    def handle(self, **options):
+        backend = get_backend()
+        with transaction.atomic():
+            backend.clear()
+        for document in documents:
+            total = 0
+            objects = document.model._default_manager.iterator()
+            for chunk in chunked(objects, options['chunk_size']):
+                with transaction.atomic():
+                    backend.index_many(chunk)
+                total += len(chunk)
+            self.stdout.write(
+                'Indexed {} {}.'.format(
+                    total, document.model._meta.verbose_name_plural))
@@ -0,0 +1,54 @@
+import logging
+
+from django.db import DatabaseError, transaction
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save)
+
+from core.signals import post_bulk_load
+
+from .backends import get_backend
+from .documents import documents, get_document
+
+logger = logging.getLogger(__name__)
+
+
+def update_index(method, *args):
+    backend = get_backend()
+    try:
+        with transaction.atomic(using=backend.using):
+            getattr(backend, method)(*args)
+    except DatabaseError:
+        logger.exception('Could not update the search index.')
+
+
+def index_object(sender, instance, **kwargs):
+    update_index('index', instance)
+
+
+def remove_object(sender, instance, **kwargs):
+    update_index('remove', instance)
+
+
+def index_objects(sender, instances, **kwargs):
+    if get_document(sender) is not None:
+        update_index('index_many', instances)
+
+
+def setup_backend(sender, using, **kwargs):
+    backend = get_backend()
+    if using == backend.using:
+        backend.setup()
+
+
+for document in documents:
+    post_save.connect(
+        index_object, sender=document.model,
+        dispatch_uid='search_index_{}'.format(document.label))
+    post_delete.connect(
+        remove_object, sender=document.model,
+        dispatch_uid='search_remove_{}'.format(document.label))
+
+post_bulk_load.connect(
+    index_objects, dispatch_uid='search_index_bulk_load')
+post_migrate.connect(
+    setup_backend, dispatch_uid='search_setup_backend')
@@ -0,0 +1,47 @@
+from .backends import get_backend
+
+
+class SearchResults:
+
+    def __init__(self, query, models=None, until=None):
+        self.backend = get_backend()
+        self.query = query
+        self.models = models
+        self.until = until
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.backend.count(
+                self.query, self.models, self.until)
+        return self._count
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        offset = key.start or 0
+        limit = None
+        if key.stop is not None:
+            limit = key.stop - offset
+        hits = self.backend.search(
+            self.query, self.models, self.until,
+            offset=offset, limit=limit)
+        pks_by_model = {}
+        for model, pk in hits:
+            pks_by_model.setdefault(model, []).append(pk)
+        objects = {
+            model: model._default_manager.in_bulk(pks)
+            for model, pks in pks_by_model.items()}
+        return [objects[model][pk] for model, pk in hits
+                if pk in objects[model]]
+
+
+class SearchIndexAdminMixin:
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return super().get_search_results(
+                request, queryset, search_term)
+        queryset = get_backend().filter_queryset(
+            queryset, search_term)
+        return queryset, False
@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.shortcuts import render
+from django.views.generic import View
+
+from .utils import SearchResults
+
+
+class SearchView(View):
+    paginate_by = 10
+    query_kwarg = 'q'
+    page_kwarg = 'page'
+    template_name = 'search/search_results.html'
+
+    def get(self, request):
+        query = request.GET.get(self.query_kwarg, '').strip()
+        if request.user.has_perm('blog.view_future_post'):
+            until = None
+        else:
+            until = date.today()
+        paginator = Paginator(
+            SearchResults(query, until=until), self.paginate_by)
+        try:
+            page = paginator.page(
+                request.GET.get(self.page_kwarg))
+        except PageNotAnInteger:
+            page = paginator.page(1)
+        except EmptyPage:
+            page = paginator.page(paginator.num_pages)
+        context = {
+            'is_paginated': page.has_other_pages(),
+            'page_obj': page,
+            'paginator': paginator,
+            'query': query,
+            'result_list': page.object_list,
+        }
+        return render(request, self.template_name, context)
@@ -45,6 +45,8 @@ INSTALLED_APPS = (
     'blog',
     'contact',
     'core',
+    'search',
+    'api',
     'django.contrib.admin',
     'django_toolbar',
 
@@ -57,6 +59,7 @@ MIDDLEWARE_CLASSES = (
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.auth.middleware.SessionAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.PageCacheMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.flatpages.middleware.FlatpageFallbackMiddleware',
@@ -184,6 +187,26 @@ AUTH_USER_MODEL = 'user.User'
 
 FIXTURE_DIRS = (os.path.join(BASE_DIR,'fixtures'),)
 
+# Page cache
+
+PAGE_CACHE_MODELS = (
+    'blog.Post',
+    'organizer.NewsLink',
+    'organizer.Startup',
+    'organizer.Tag',
+)
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Sitemaps
+
+SITEMAPS = (
+    'blog.sitemaps.PostSitemap',
+    'organizer.sitemaps.StartupSitemap',
+    'organizer.sitemaps.TagSitemap',
+)
+
+SITEMAP_CACHE_DIR = os.path.join(BASE_DIR, 'cache', 'sitemaps')
+
 
 
 
@@ -3,8 +3,11 @@ from django.contrib import admin
 from django.views.generic import RedirectView, TemplateView
 
 
+from api import urls as api_urls
 from blog import urls as blog_urls
 from contact import urls as contact_urls
+from core.views import SitemapIndex, SitemapShard
+from search import urls as search_urls
 from organizer.urls import (
     startup as startup_urls,
     tag as tag_urls)
@@ -21,10 +24,18 @@ urlpatterns = [
     url(r'^contact/', include(contact_urls)),
     url(r'^admin/', include(admin.site.urls)),
     url(r'^blog/', include(blog_urls)),
+    url(r'^search/', include(search_urls)),
+    url(r'^api/', include(api_urls)),
     url(r'^about/$',
         TemplateView.as_view(
             template_name='site/about.html'),
         name='about_site'),
+    url(r'^sitemap\.xml$',
+        SitemapIndex.as_view(),
+        name='sitemap_index'),
+    url(r'^sitemap-(?P<section>\w+)-(?P<shard>\d+)\.xml$',
+        SitemapShard.as_view(),
+        name='sitemap_shard'),
     url(r'^$', RedirectView.as_view(
             pattern_name='blog_post_list',
             permanent=False)),
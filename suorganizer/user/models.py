@@ -26,6 +26,7 @@ class Profile(models.Model):
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
+    natural_key_fields = ('email',)
 
     def _create_user(self, email, password, **kwargs):
         email = self.normalize_email(email)